@@ -31,6 +31,10 @@ def main():
     if args.card_url:
         print(f"[purple-agent] Advertising card URL: {args.card_url}", flush=True)
 
+    # uvicorn[standard] ships uvloop + httptools, and the default loop="auto" /
+    # http="auto" pick them when importable (stock asyncio/h11 otherwise).
+    # Keep a single worker: sessions, the RL case log and tau2 histories live
+    # in process memory, so gunicorn-style multi-worker setups would split them.
     uvicorn.run(
         "src.server:app",
         host=args.host,
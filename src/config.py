@@ -10,7 +10,9 @@ FALLBACK_MODEL = os.getenv("FALLBACK_MODEL", "claude-sonnet-4-6")
 FAST_MODEL = os.getenv("FAST_MODEL", "claude-haiku-4-5-20251001")
 TOOL_TIMEOUT = int(os.getenv("TOOL_TIMEOUT", "10"))
 TASK_TIMEOUT = int(os.getenv("TASK_TIMEOUT", "120"))
+CLASSIFIER_CACHE_TTL = float(os.getenv("CLASSIFIER_CACHE_TTL", "3600"))  # seconds; 0 disables the cache
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+PRETTY_STATE_FILES = os.getenv("PRETTY_STATE_FILES", "") == "1"  # indent case_log / intelligence JSON (debug)
 
 # ── Training pipeline ─────────────────────────────────────────────────────────
 S3_TRAINING_BUCKET = os.getenv("S3_TRAINING_BUCKET", "nexusbrain-codebuild-source-848269696611")
@@ -0,0 +1,38 @@
+"""
+llm_client.py
+Shared AsyncAnthropic client for the modules that call Claude directly
+(self_moa, self_reflection, smart_classifier, recovery_agent).
+
+Created lazily on first use and reused, so every caller draws on one httpx
+connection pool instead of opening its own. server.on_shutdown closes it.
+Per-call settings (timeout, retries) go through client.with_options(...),
+which shares the same pool.
+"""
+from __future__ import annotations
+
+from src.config import ANTHROPIC_API_KEY
+
+try:
+    import anthropic
+except ImportError:  # callers fall back (keywords, heuristics) without the SDK
+    anthropic = None
+
+_client = None
+
+
+def get_client():
+    """The shared AsyncAnthropic client. Raises ImportError if the SDK is not installed."""
+    global _client
+    if _client is None:
+        if anthropic is None:
+            raise ImportError("anthropic SDK not installed")
+        _client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (server shutdown)."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
@@ -11,20 +11,51 @@ agent tries up to 4 strategies before graceful degradation:
   Strategy 4: Ask Haiku for an alternative approach
   Strategy 5: Partial answer with what we have (graceful degrade)
 
+Strategies 2 and 3 are raced concurrently for read tools; the first success
+wins. Write tools, or read tools with a write-like synonym, are never raced.
+
 All recovery is non-blocking and fire-and-forget safe.
 A failed recovery never crashes the task — it always returns something.
 """
 from __future__ import annotations
 import asyncio
+import hashlib
 import json
+import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from difflib import get_close_matches, SequenceMatcher
+from functools import lru_cache
+from itertools import groupby
+from heapq import nlargest
 from typing import Callable, Awaitable, Any
 
+try:
+    # Optional C extension (python-Levenshtein), far faster. Its ratio is indel-distance
+    # based (full LCS), so it generally scores higher than SequenceMatcher's matching blocks;
+    # listed in requirements.txt so every deployment scores Tier 3 the same way.
+    from Levenshtein import ratio as _levenshtein_ratio
+except ImportError:
+    _levenshtein_ratio = None
+
 from src.config import ANTHROPIC_API_KEY
+from src.llm_client import get_client
+from src.mutation_verifier import _is_write_tool
 
 RECOVERY_MODEL = "claude-haiku-4-5-20251001"
 RECOVERY_TIMEOUT = 8.0    # seconds per recovery attempt
+SYNONYM_NOUN_CUTOFF = 0.5   # Tier 1 noun similarity
+SYNONYM_NAME_CUTOFF = 0.55  # Tier 2 full-name similarity
+SYNONYM_RATIO_FLOOR = 0.5   # Tier 3 ratio fallback
+SYNONYM_BIGRAM_FLOOR = 0.3  # Tier 3 cheap prefilter (bigram Jaccard)
+RECOVERY_MAX_CONCURRENCY = 2  # concurrent backend calls while racing strategies
+ADVICE_CACHE_TTL = 3600.0   # seconds a Haiku suggestion stays reusable
+ADVICE_CACHE_MAX = 256
+
+# sha256(tool, error, tool list) -> (suggestion, expires_at)
+_advice_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+_INDEX_RE = re.compile(r"-?\d+")
 
 
 @dataclass
@@ -36,127 +67,326 @@ class RecoveryResult:
     attempts: int
 
 
-def _is_empty_result(result: Any) -> bool:
-    """True if the tool result is effectively empty/failed."""
+# _classify_result outcomes
+RESULT_OK = 0
+RESULT_EMPTY = 1
+RESULT_ERROR = 2
+
+_EMPTY_KEYS = ("data", "items", "records", "rows", "list", "results")
+
+
+def _classify_result(result: Any) -> int:
+    """
+    One-pass tool result check: RESULT_OK, RESULT_EMPTY or RESULT_ERROR.
+    Runs on every tool call, so the success path does a single isinstance
+    branch, one "error" probe and one sweep of the collection keys.
+    """
     if result is None:
-        return True
+        return RESULT_EMPTY
     if isinstance(result, dict):
-        if result.get("error"):
-            return True
+        if not result:
+            return RESULT_EMPTY
+        get = result.get
+        if get("error"):
+            return RESULT_ERROR
         # Check all common collection keys for empty collections
-        for key in ("data", "items", "records", "rows", "list", "results"):
-            val = result.get(key)
-            if val is not None and isinstance(val, (list, dict)) and len(val) == 0:
+        for key in _EMPTY_KEYS:
+            val = get(key)
+            if not val and isinstance(val, (list, dict)):
                 # Don't treat as empty if total/count shows real data exists (filtered result)
-                if result.get("total", result.get("count", result.get("total_count", 0))) > 0:
+                if get("total", get("count", get("total_count", 0))) > 0:
                     continue
-                return True
-        if result == {} or result == {"status": "error"}:
-            return True
-    if isinstance(result, list) and len(result) == 0:
-        return True
-    return False
+                return RESULT_EMPTY
+        if len(result) == 1 and get("status") == "error":
+            return RESULT_ERROR
+        return RESULT_OK
+    if isinstance(result, list) and not result:
+        return RESULT_EMPTY
+    return RESULT_OK
 
 
-def _is_error_result(result: Any) -> bool:
-    """True if result contains an explicit error."""
-    if isinstance(result, dict) and result.get("error"):
-        return True
-    return False
+def _is_empty_result(result: Any) -> bool:
+    """True if the tool result is effectively empty/failed."""
+    return _classify_result(result) != RESULT_OK
+
+
+def _length_compatible(la: int, candidate: str, cutoff: float, inclusive: bool = False) -> bool:
+    """
+    O(1) upper bound on the similarity ratio from string lengths alone.
+
+    ratio = 2*M / (la + lb) and M <= min(la, lb), so a pair whose length bound
+    cannot pass the cutoff is rejected without running the matcher. inclusive
+    matches a `ratio >= cutoff` test (get_close_matches); otherwise `ratio > cutoff`.
+    """
+    lb = len(candidate)
+    total = la + lb
+    if total == 0:
+        return False
+    bound = 2.0 * min(la, lb) / total
+    return bound >= cutoff if inclusive else bound > cutoff
 
 
 # ── Recovery strategies ───────────────────────────────────────────────────────
 
-async def _try_dynamic_synonym(
+async def _race_first_success(racers: dict[asyncio.Task, str]) -> tuple[str, Any] | None:
+    """
+    Await strategy tasks concurrently; return (strategy, result) for the first
+    non-None result and cancel the rest. Ties within one wake-up go to the
+    task listed first, so synonym keeps priority over decompose.
+    """
+    pending = set(racers)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in racers:
+                if task not in done or task.cancelled() or task.exception() is not None:
+                    continue
+                result = task.result()
+                if result is not None:
+                    return racers[task], result
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _call_candidate(
+    call_fn: Callable,
     tool_name: str,
     params: dict,
-    call_fn: Callable,
-    available_tools: list[dict],
+    slots: asyncio.Semaphore | None = None,
 ) -> Any | None:
     """
-    Strategy 2: dynamically find alternative tool names via difflib similarity.
+    One recovery call: the result if non-empty, else None. Never raises (except cancel).
+    With slots, RECOVERY_TIMEOUT starts once a slot is held — time spent queued
+    behind other recovery calls doesn't eat into the call's budget.
+    """
+    try:
+        if slots is None:
+            result = await asyncio.wait_for(call_fn(tool_name, params), timeout=RECOVERY_TIMEOUT)
+        else:
+            async with slots:
+                result = await asyncio.wait_for(call_fn(tool_name, params), timeout=RECOVERY_TIMEOUT)
+    except Exception:
+        return None
+    return None if _is_empty_result(result) else result
+
+
+def _tools_key(available_tools: list[dict]) -> tuple[str, ...]:
+    """Hashable, order-independent fingerprint of the available tool names."""
+    return tuple(sorted({t.get("name") for t in available_tools if t.get("name")}))
+
+
+def _similarity(a: str, b: str) -> float:
+    """
+    Tier-3 similarity ratio in [0, 1]: Levenshtein.ratio when installed, else difflib.
+    The two are not identical — Levenshtein's LCS-based ratio is generally higher.
+    """
+    if _levenshtein_ratio is not None:
+        return _levenshtein_ratio(a, b)
+    return SequenceMatcher(None, a, b).ratio()
 
-    Replaces the static _TOOL_SYNONYMS dict (13 hardcoded entries) with a
-    multi-tier similarity search across all tools actually available at runtime.
+
+def _canonical(name: str) -> str:
+    """Case/separator-insensitive form: getUser, get_user and get-user all map to 'getuser'."""
+    return "".join(c for c in name.casefold() if c.isalnum())
+
+
+@lru_cache(maxsize=64)
+def _canonical_index(tools_key: tuple[str, ...]) -> dict[str, tuple[str, ...]]:
+    """{canonical form: tool names} — built once per tool set."""
+    index: dict[str, list[str]] = {}
+    for name in tools_key:
+        index.setdefault(_canonical(name), []).append(name)
+    return {k: tuple(v) for k, v in index.items()}
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _bigram_overlap(a: set[str], b: set[str]) -> float:
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+@lru_cache(maxsize=64)
+def _verb_index(tools_key: tuple[str, ...]) -> dict[str, dict[str, str]]:
+    """
+    Bucket tool names by verb prefix: {verb: {noun: full_name}}.
+    Built once per tool set so Tier 1 is a dict probe instead of a full scan.
+    """
+    index: dict[str, dict[str, str]] = {}
+    for name in tools_key:
+        verb, sep, noun = name.partition("_")
+        if sep:
+            index.setdefault(verb, {})[noun] = name
+    return index
+
+
+@lru_cache(maxsize=256)
+def _resolve_candidates(tool_name: str, tools_key: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Rank alternative tool names for tool_name via a multi-tier similarity search.
 
     Tiers:
+      0. Same canonical form (getUser ↔ get_user) — O(1), skips the rest on a hit
       1. Same verb prefix + closest noun (e.g. get_employee → get_staff if closer noun)
       2. Full-name difflib similarity (cutoff 0.55)
       3. Levenshtein ratio fallback (>0.5)
+
+    Names whose length alone rules out the tier cutoff are skipped before any
+    similarity scoring, and Tier 3 also drops names sharing too few bigrams.
+    Pure function of its arguments, so results are cached per
+    (tool_name, tools_key) — repeat failures within a session skip the whole
+    cascade.
     """
-    available_names = [
-        t.get("name", "")
-        for t in available_tools
-        if t.get("name") and t.get("name") != tool_name
-    ]
+    available_names = [n for n in tools_key if n != tool_name]
     if not available_names:
-        return None
+        return ()
+
+    # Tier 0: exact match after case/separator normalization
+    canonical = _canonical(tool_name)
+    same_form = tuple(n for n in _canonical_index(tools_key).get(canonical, ()) if n != tool_name)
+    if same_form:
+        return same_form[:4]
 
     candidates: list[str] = []
 
     # Tier 1: same verb prefix, closest noun match
-    parts = tool_name.split("_")
-    verb = parts[0] if parts else ""
-    noun = "_".join(parts[1:]) if len(parts) > 1 else ""
-
-    same_verb = [n for n in available_names if n.startswith(verb + "_")]
-    if noun and same_verb:
-        nouns_in_family = {"_".join(n.split("_")[1:]): n for n in same_verb}
-        close_nouns = get_close_matches(noun, list(nouns_in_family.keys()), n=3, cutoff=0.5)
+    verb, _, noun = tool_name.partition("_")
+
+    family = _verb_index(tools_key).get(verb) if noun else None
+    if family:
+        noun_len = len(noun)
+        nouns_in_family = {
+            fam_noun: n
+            for fam_noun, n in family.items()
+            if n != tool_name and _length_compatible(noun_len, fam_noun, SYNONYM_NOUN_CUTOFF, inclusive=True)
+        }
+        close_nouns = get_close_matches(noun, list(nouns_in_family.keys()), n=3, cutoff=SYNONYM_NOUN_CUTOFF)
         for cn in close_nouns:
             full_name = nouns_in_family[cn]
             if full_name not in candidates:
                 candidates.append(full_name)
 
     # Tier 2: full-name difflib similarity
-    close = get_close_matches(tool_name, available_names, n=3, cutoff=0.55)
+    close = get_close_matches(tool_name, available_names, n=3, cutoff=SYNONYM_NAME_CUTOFF)
     for c in close:
         if c not in candidates:
             candidates.append(c)
 
     # Tier 3: Levenshtein ratio fallback
     if not candidates:
-        scored = [
-            (SequenceMatcher(None, tool_name, n).ratio(), n)
+        name_len = len(tool_name)
+        name_bigrams = _bigrams(canonical)
+        scored = (
+            (_similarity(tool_name, n), n)
             for n in available_names
-        ]
-        scored.sort(reverse=True)
-        candidates = [n for ratio, n in scored[:3] if ratio > 0.5]
-
-    for candidate in candidates[:4]:
-        try:
-            result = await asyncio.wait_for(call_fn(candidate, params), timeout=RECOVERY_TIMEOUT)
-            if not _is_empty_result(result):
-                return result
-        except Exception:
+            if _length_compatible(name_len, n, SYNONYM_RATIO_FLOOR)
+            and _bigram_overlap(name_bigrams, _bigrams(_canonical(n))) >= SYNONYM_BIGRAM_FLOOR
+        )
+        candidates = [n for ratio, n in nlargest(3, scored) if ratio > SYNONYM_RATIO_FLOOR]
+
+    return tuple(candidates[:4])
+
+
+async def _try_dynamic_synonym(
+    tool_name: str,
+    params: dict,
+    call_fn: Callable,
+    available_tools: list[dict],
+    tools_key: tuple[str, ...] | None = None,
+    slots: asyncio.Semaphore | None = None,
+) -> Any | None:
+    """
+    Strategy 2: dynamically find alternative tool names via difflib similarity.
+
+    Replaces the static _TOOL_SYNONYMS dict (13 hardcoded entries) with a
+    multi-tier similarity search across all tools actually available at runtime
+    (see _resolve_candidates). Consecutive read-only candidates are tried
+    concurrently; candidates are otherwise tried in rank order.
+    """
+    if tools_key is None:
+        tools_key = _tools_key(available_tools)
+
+    candidates = _resolve_candidates(tool_name, tools_key)
+    if not candidates:
+        return None
+
+    # Walk the ranking in order. A run of read-only candidates is independent —
+    # try it concurrently, first hit wins. Write-like candidates run one at a
+    # time so a losing racer can never mutate state after another candidate
+    # already succeeded.
+    for is_write, run in groupby(candidates, key=_is_write_tool):
+        run = list(run)
+        if is_write or len(run) == 1:
+            for candidate in run:
+                result = await _call_candidate(call_fn, candidate, params, slots)
+                if result is not None:
+                    return result
             continue
+        winner = await _race_first_success({
+            asyncio.create_task(_call_candidate(call_fn, candidate, params, slots)): candidate
+            for candidate in run
+        })
+        if winner is not None:
+            return winner[1]
 
     return None
 
 
+_ESSENTIAL_PARAMS = frozenset({"id", "name", "email", "organization_id", "session_id"})
+
+
+@lru_cache(maxsize=512)
+def _droppable_params(param_keys: frozenset[str]) -> frozenset[str]:
+    """Non-essential filter* keys that decomposition strips, cached per key set."""
+    return frozenset(k for k in param_keys if k.startswith("filter") and k not in _ESSENTIAL_PARAMS)
+
+
 async def _try_decompose(
     tool_name: str,
     params: dict,
     call_fn: Callable,
+    slots: asyncio.Semaphore | None = None,
 ) -> Any | None:
     """Strategy 3: try a simpler version of the call (fewer params)."""
     if not params:
         return None
 
     # Try removing optional/complex params one by one
-    essential_keys = {"id", "name", "email", "organization_id", "session_id"}
-    simplified = {k: v for k, v in params.items() if k in essential_keys or not k.startswith("filter")}
-
-    if simplified == params:
+    drop = _droppable_params(frozenset(params))
+    if not drop:
         return None  # Nothing to simplify
+    simplified = {k: v for k, v in params.items() if k not in drop}
+
+    return await _call_candidate(call_fn, tool_name, simplified, slots)
+
+
+def _advice_key(tool_name: str, error_msg: str, tool_list: list[str]) -> str:
+    payload = json.dumps({"tool": tool_name, "err": error_msg[:100], "tools": tool_list}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cached_advice(key: str) -> str | None:
+    """Return a live cached Haiku suggestion ("" = Haiku said none), else None."""
+    entry = _advice_cache.get(key)
+    if entry is None:
+        return None
+    suggestion, expires_at = entry
+    if expires_at < time.monotonic():
+        del _advice_cache[key]
+        return None
+    _advice_cache.move_to_end(key)
+    return suggestion
 
-    try:
-        result = await asyncio.wait_for(call_fn(tool_name, simplified), timeout=RECOVERY_TIMEOUT)
-        if not _is_empty_result(result):
-            return result
-    except Exception:
-        pass
-    return None
+
+def _store_advice(key: str, suggestion: str) -> None:
+    _advice_cache[key] = (suggestion, time.monotonic() + ADVICE_CACHE_TTL)
+    _advice_cache.move_to_end(key)
+    while len(_advice_cache) > ADVICE_CACHE_MAX:
+        _advice_cache.popitem(last=False)
 
 
 async def _ask_haiku_alternative(
@@ -165,32 +395,42 @@ async def _ask_haiku_alternative(
     error_msg: str,
     available_tools: list[dict],
 ) -> str:
-    """Strategy 4: ask Haiku what to try instead."""
+    """
+    Strategy 4: ask Haiku what to try instead.
+    Answers are cached for an hour per (tool, error, tool list) so a failure
+    that repeats doesn't pay another LLM roundtrip.
+    """
     if not ANTHROPIC_API_KEY or not available_tools:
         return ""
+    # Expanded to 30 tools (was 15) for better coverage in large tool sets
+    tool_list = [t.get("name") for t in available_tools[:30] if t.get("name")]
+    cache_key = _advice_key(tool_name, error_msg, tool_list)
+    cached = _cached_advice(cache_key)
+    if cached is not None:
+        return cached
     try:
-        import anthropic
-        # Expanded to 30 tools (was 15) for better coverage in large tool sets
-        tool_list = [t.get("name") for t in available_tools[:30] if t.get("name")]
-        client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+        client = get_client()
+        numbered = "\n".join(f"{i}. {name}" for i, name in enumerate(tool_list))
         resp = await asyncio.wait_for(
             client.messages.create(
                 model=RECOVERY_MODEL,
-                max_tokens=80,
+                max_tokens=8,
                 messages=[{
                     "role": "user",
                     "content": (
                         f"Tool '{tool_name}' failed: {error_msg[:100]}\n"
-                        f"Available tools: {', '.join(tool_list)}\n"
-                        "Reply with just the best alternative tool name to try, or 'none'."
+                        f"Available tools:\n{numbered}\n"
+                        "Reply with only the integer index of the best alternative tool, or -1."
                     ),
                 }],
             ),
             timeout=4.0,
         )
-        suggestion = resp.content[0].text.strip().strip('"').strip("'") if resp.content else ""
-        if suggestion and suggestion != "none" and any(t.get("name") == suggestion for t in available_tools):
-            return suggestion
+        m = _INDEX_RE.search(resp.content[0].text) if resp.content else None
+        idx = int(m.group()) if m else -1
+        suggestion = tool_list[idx] if 0 <= idx < len(tool_list) and tool_list[idx] != tool_name else ""
+        _store_advice(cache_key, suggestion)
+        return suggestion
     except Exception:
         pass
     return ""
@@ -204,10 +444,15 @@ async def recover_tool_call(
     failed_result: Any,
     call_fn: Callable[[str, dict], Awaitable[Any]],
     available_tools: list[dict] | None = None,
+    tools_key: tuple[str, ...] | None = None,
+    slots: asyncio.Semaphore | None = None,
 ) -> RecoveryResult:
     """
     Attempt to recover a failed/empty tool call.
     call_fn: async (tool_name, params) -> result
+    tools_key: precomputed _tools_key(available_tools), if the caller has one
+    slots: semaphore bounding concurrent recovery calls; each call's timeout
+           starts once it holds a slot
     Returns RecoveryResult — always returns something, never raises.
     """
     available_tools = available_tools or []
@@ -215,29 +460,39 @@ async def recover_tool_call(
     if isinstance(failed_result, dict):
         error_msg = str(failed_result.get("error", ""))
 
-    attempts = 0
-
-    # Strategy 2: dynamic synonym tools (replaces static _TOOL_SYNONYMS dict)
-    attempts += 1
-    syn_result = await _try_dynamic_synonym(tool_name, params, call_fn, available_tools)
-    if syn_result is not None:
-        return RecoveryResult(
-            recovered=True,
-            strategy="synonym",
-            result=syn_result,
-            explanation=f"Recovered '{tool_name}' using dynamically matched synonym tool",
-            attempts=attempts,
+    # Strategies 2 + 3 are independent — race them and keep the first success.
+    # Anything that would send a write stays sequential: cancelling the losing
+    # strategy could abort a write that already reached the backend.
+    attempts = 2
+    if tools_key is None:
+        tools_key = _tools_key(available_tools)
+    strategies = {
+        "synonym": lambda: _try_dynamic_synonym(tool_name, params, call_fn, available_tools, tools_key, slots),
+        "decompose": lambda: _try_decompose(tool_name, params, call_fn, slots),
+    }
+    winner = None
+    if _is_write_tool(tool_name) or any(map(_is_write_tool, _resolve_candidates(tool_name, tools_key))):
+        for strategy, run in strategies.items():
+            result = await run()
+            if result is not None:
+                winner = strategy, result
+                break
+    else:
+        winner = await _race_first_success({
+            asyncio.create_task(run()): strategy for strategy, run in strategies.items()
+        })
+    if winner is not None:
+        strategy, result = winner
+        explanation = (
+            f"Recovered '{tool_name}' using dynamically matched synonym tool"
+            if strategy == "synonym"
+            else f"Recovered '{tool_name}' with simplified parameters"
         )
-
-    # Strategy 3: decompose (simplify params)
-    attempts += 1
-    decomp_result = await _try_decompose(tool_name, params, call_fn)
-    if decomp_result is not None:
         return RecoveryResult(
             recovered=True,
-            strategy="decompose",
-            result=decomp_result,
-            explanation=f"Recovered '{tool_name}' with simplified parameters",
+            strategy=strategy,
+            result=result,
+            explanation=explanation,
             attempts=attempts,
         )
 
@@ -245,18 +500,15 @@ async def recover_tool_call(
     attempts += 1
     alt_tool = await _ask_haiku_alternative(tool_name, params, error_msg, available_tools)
     if alt_tool:
-        try:
-            alt_result = await asyncio.wait_for(call_fn(alt_tool, params), timeout=RECOVERY_TIMEOUT)
-            if not _is_empty_result(alt_result):
-                return RecoveryResult(
-                    recovered=True,
-                    strategy="llm_advice",
-                    result=alt_result,
-                    explanation=f"Recovered using Haiku-suggested alternative: '{alt_tool}'",
-                    attempts=attempts,
-                )
-        except Exception:
-            pass
+        alt_result = await _call_candidate(call_fn, alt_tool, params, slots)
+        if alt_result is not None:
+            return RecoveryResult(
+                recovered=True,
+                strategy="llm_advice",
+                result=alt_result,
+                explanation=f"Recovered using Haiku-suggested alternative: '{alt_tool}'",
+                attempts=attempts,
+            )
 
     # Strategy 5: graceful degradation
     return RecoveryResult(
@@ -279,18 +531,27 @@ def wrap_with_recovery(
     Wraps a tool call function with automatic recovery.
     Drop-in replacement for on_tool_call in worker_brain._execute().
 
+    Recovery calls share a semaphore so racing strategies never put more than
+    RECOVERY_MAX_CONCURRENCY extra calls on the backend at once. A call's
+    RECOVERY_TIMEOUT only starts once it holds a slot.
+
     Usage:
         on_tool_call = wrap_with_recovery(raw_call_fn, available_tools=self._tools)
     """
+    recovery_slots = asyncio.Semaphore(RECOVERY_MAX_CONCURRENCY)
+    tools_key = _tools_key(available_tools or [])
+
     async def wrapped(tool_name: str, params: dict) -> Any:
         result = await call_fn(tool_name, params)
-        if _is_empty_result(result) or _is_error_result(result):
+        if _classify_result(result) != RESULT_OK:
             recovery = await recover_tool_call(
                 tool_name=tool_name,
                 params=params,
                 failed_result=result,
                 call_fn=call_fn,
                 available_tools=available_tools,
+                tools_key=tools_key,
+                slots=recovery_slots,
             )
             return recovery.result
         return result
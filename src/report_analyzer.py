@@ -7,8 +7,9 @@ This intelligence is injected into build_rl_primer() so the agent knows
 EXACTLY where it lost points last run and what to do differently.
 """
 from __future__ import annotations
-import json
 import os
+import re
+import threading
 import time
 
 from src.config import (
@@ -17,61 +18,261 @@ from src.config import (
     BENCHMARK_API_URL,
     BRAINOS_API_KEY,
 )
+from src.state_files import loads_state, read_json, write_json_atomic
+
+try:
+    # Optional: stream large reports row by row instead of decoding the whole body
+    import ijson  # type: ignore
+    _IJSON_OK = True
+except ImportError:
+    _IJSON_OK = False
 
 INTELLIGENCE_PATH = os.path.join(os.path.dirname(__file__), "..", "benchmark_intelligence.json")
 STALE_HOURS = 6   # refresh reports more frequently than training data
 
+# boto3 client construction parses the whole service model — build it once
+_S3_CLIENT = None
+_S3_PAGINATOR = None
+# Keep-alive pool for the BENCHMARK_API_URL fallback (reuses TCP + TLS sessions)
+_HTTP_CLIENT = None
+
+# (mtime_ns, size) of INTELLIGENCE_PATH + parsed dict — skips JSON re-parse per task
+_INTEL_STAMP: tuple[int, int] | None = None
+_INTEL_CACHED: dict = {}
+_INTEL_LOCK = threading.Lock()
+# (intel stamp, rendered primer) — the primer only changes when the file does
+_PRIMER_CACHE: tuple[tuple[int, int], str] | None = None
+
 
 # ── Download helpers ──────────────────────────────────────────────────────────
 
-def _latest_report_from_s3() -> dict | None:
-    """Download the most-recent report JSON from S3 reports prefix."""
-    try:
+def _s3():
+    """Lazy module-level S3 client + list_objects_v2 paginator (raises ImportError without boto3)."""
+    global _S3_CLIENT, _S3_PAGINATOR
+    if _S3_CLIENT is None:
         import boto3  # type: ignore
-        s3 = boto3.client("s3")
-        paginator = s3.get_paginator("list_objects_v2")
-        objects = []
-        for page in paginator.paginate(Bucket=S3_TRAINING_BUCKET, Prefix=S3_REPORTS_PREFIX):
-            objects.extend(page.get("Contents", []))
-
-        # Sort by LastModified, pick newest .json
-        json_objs = [o for o in objects if o["Key"].endswith(".json")]
-        if not json_objs:
+        from botocore.config import Config  # type: ignore
+        _S3_CLIENT = boto3.client(
+            "s3",
+            config=Config(max_pool_connections=20, retries={"max_attempts": 2}),
+        )
+        _S3_PAGINATOR = _S3_CLIENT.get_paginator("list_objects_v2")
+    return _S3_CLIENT, _S3_PAGINATOR
+
+
+def _http():
+    """Lazy module-level httpx client bound to BENCHMARK_API_URL."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        import httpx
+        _HTTP_CLIENT = httpx.Client(
+            base_url=BENCHMARK_API_URL,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+            transport=httpx.HTTPTransport(retries=2),
+        )
+    return _HTTP_CLIENT
+
+
+def _newest_s3_report() -> dict | None:
+    """Listing entry (Key, ETag, LastModified, ...) of the newest report JSON, or None."""
+    try:
+        _, paginator = _s3()
+
+        # Track the newest .json while paging — never materialize the listing
+        latest = None
+        for page in paginator.paginate(
+            Bucket=S3_TRAINING_BUCKET,
+            Prefix=S3_REPORTS_PREFIX,
+            PaginationConfig={"PageSize": 1000},
+        ):
+            for o in page.get("Contents", ()):
+                if o["Key"].endswith(".json") and (latest is None or o["LastModified"] > latest["LastModified"]):
+                    latest = o
+        return latest
+    except Exception:
+        return None
+
+
+def _latest_report_from_s3(latest: dict | None = None) -> tuple[dict, _ResultAccumulator | None] | None:
+    """Download the most-recent report JSON from S3 reports prefix (or the given listing entry)."""
+    try:
+        if latest is None:
+            latest = _newest_s3_report()
+        if latest is None:
             return None
-        latest = max(json_objs, key=lambda o: o["LastModified"])
-        resp = s3.get_object(Bucket=S3_TRAINING_BUCKET, Key=latest["Key"])
-        return json.loads(resp["Body"].read().decode("utf-8"))
+        s3, _ = _s3()
+        body = s3.get_object(Bucket=S3_TRAINING_BUCKET, Key=latest["Key"])["Body"]
+        try:
+            if _IJSON_OK:
+                return _stream_report(body)
+            return _as_fetched(loads_state(body.read()))
+        finally:
+            body.close()
     except Exception:
         return None
 
 
-def _latest_report_from_http() -> dict | None:
+def _latest_report_from_http() -> tuple[dict, _ResultAccumulator | None] | None:
     """Fallback: trigger a fresh report via HTTP."""
     try:
-        import urllib.request
-        url = f"{BENCHMARK_API_URL}/report/now?hours=4"
-        req = urllib.request.Request(
-            url,
-            method="POST",
+        with _http().stream(
+            "POST",
+            "/report/now",
+            params={"hours": 4},
             headers={
                 "Authorization": f"Bearer {BRAINOS_API_KEY}",
                 "Content-Type": "application/json",
             },
-        )
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+        ) as resp:
+            resp.raise_for_status()
+            if _IJSON_OK:
+                # Parse while the body is still arriving from the socket
+                return _stream_report(_ChunkReader(resp.iter_bytes(65536)))
+            return _as_fetched(loads_state(resp.read()))
     except Exception:
         return None
 
 
+class _ChunkReader:
+    """Minimal file-like read() over an iterator of byte chunks — what ijson consumes."""
+
+    def __init__(self, chunks) -> None:
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""  # ijson probes read(0) to detect bytes vs str
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
 # ── Report parsing ────────────────────────────────────────────────────────────
 
-def _parse_dimension_scores(report: dict) -> dict[str, float]:
+_MISSING = object()
+
+
+def _get_first(d: dict, *keys: str, default=None):
+    """d[k] for the first key present, else default — one lookup per key, no eager fallbacks."""
+    for k in keys:
+        v = d.get(k, _MISSING)
+        if v is not _MISSING:
+            return v
+    return default
+
+
+_RESULT_DIMENSIONS = frozenset({"quality", "correctness", "tool_use", "policy", "format"})
+MAX_FAILURE_PATTERNS = 30   # cap to avoid bloat
+
+
+class _ResultAccumulator:
+    """Running reduction of report["results"] rows — fed from a list or an ijson stream."""
+
+    __slots__ = ("dims", "is_dim", "patterns", "count")
+
+    def __init__(self) -> None:
+        self.dims: dict[str, list] = {}       # dimension → [running sum, count]
+        self.is_dim: dict[str, bool] = {}     # field name → is it a score dimension (rows share keys)
+        self.patterns: list[dict] = []
+        self.count = 0
+
+    def add(self, result: dict) -> None:
+        self.count += 1
+        dims, is_dim = self.dims, self.is_dim
+        for k, v in result.items():
+            hit = is_dim.get(k)
+            if hit is None:
+                hit = is_dim[k] = k.endswith("_score") or k in _RESULT_DIMENSIONS
+            if hit and isinstance(v, (int, float)):
+                entry = dims.get(k)
+                if entry is None:
+                    dims[k] = [float(v), 1]
+                else:
+                    entry[0] += float(v)
+                    entry[1] += 1
+
+        if len(self.patterns) < MAX_FAILURE_PATTERNS:
+            _collect_failure_patterns(result, self.patterns)
+
+
+def _as_fetched(report) -> tuple[dict, None] | None:
+    """Wrap a fully decoded report in the (report, accumulator) shape the fetchers return."""
+    return (report, None) if report else None
+
+
+def _stream_report(fp) -> tuple[dict, _ResultAccumulator | None] | None:
+    """
+    Incrementally parse a report with ijson. Every top-level value except
+    "results" is built as usual; "results" rows are built one at a time and
+    folded into a _ResultAccumulator, so the full list is never held.
+    """
+    top: dict = {}
+    acc: _ResultAccumulator | None = None
+    events = ijson.parse(fp, use_float=True)
+    first = next(events, None)
+    if first is None or first[1] != "start_map":
+        return None  # not an object-shaped report
+
+    key = None
+    in_results = False
+    builder = None
+    depth = 0
+    for prefix, event, value in events:
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    if in_results:
+                        acc.add(builder.value)
+                    else:
+                        top[key] = builder.value
+                    builder = None
+            continue
+
+        if in_results:
+            if event == "end_array" and prefix == "results":
+                in_results = False
+            elif event in ("start_map", "start_array"):
+                builder, depth = ijson.ObjectBuilder(), 1
+                builder.event(event, value)
+            else:
+                acc.add(value)  # scalar row — same failure mode as the list path
+            continue
+
+        if event == "map_key":
+            key = value
+        elif event == "end_map":
+            break
+        elif key == "results" and event == "start_array":
+            top.pop("results", None)  # a later duplicate key wins, as in json.loads
+            acc, in_results = _ResultAccumulator(), True
+        elif event in ("start_map", "start_array"):
+            builder, depth = ijson.ObjectBuilder(), 1
+            builder.event(event, value)
+        else:
+            top[key] = value
+
+    if not top and acc is None:
+        return None
+    return top, acc
+
+
+def _parse_report(report: dict, acc: _ResultAccumulator | None = None) -> tuple[dict[str, float], list[dict]]:
     """
-    Extract per-dimension scores from benchmark report.
-    Handles both flat and nested report formats.
+    Extract per-dimension scores and actionable failure patterns in one pass
+    over report["results"]. Handles both flat and nested report formats.
+    Pass acc when the results rows were already streamed into it.
+
+    Returns (dimension_scores, failure_patterns) where each pattern is a
+    {task, dimension, score, guidance} dict.
     """
     scores: dict[str, float] = {}
+    patterns: list[dict] = []
 
     # Format 1: top-level "dimensions" key
     dims = report.get("dimensions", {})
@@ -80,19 +281,19 @@ def _parse_dimension_scores(report: dict) -> dict[str, float]:
             if isinstance(v, (int, float)):
                 scores[k] = float(v)
             elif isinstance(v, dict):
-                scores[k] = float(v.get("score", v.get("average", 0)))
-
-    # Format 2: "results" list with per-task scores
-    results = report.get("results", [])
-    if isinstance(results, list):
-        dim_totals: dict[str, list[float]] = {}
-        for result in results:
-            for k, v in result.items():
-                if k.endswith("_score") or k in ("quality", "correctness", "tool_use", "policy", "format"):
-                    if isinstance(v, (int, float)):
-                        dim_totals.setdefault(k, []).append(float(v))
-        for k, vals in dim_totals.items():
-            scores[k] = round(sum(vals) / len(vals), 3)
+                scores[k] = float(_get_first(v, "score", "average", default=0))
+
+    # Format 2: "results" list with per-task scores + errors
+    if acc is None:
+        results = report.get("results", [])
+        if isinstance(results, list):
+            acc = _ResultAccumulator()
+            for result in results:
+                acc.add(result)
+    if acc is not None:
+        for k, (total, n) in acc.dims.items():
+            scores[k] = round(total / n, 3)
+        patterns = acc.patterns
 
     # Format 3: "summary" block
     summary = report.get("summary", {})
@@ -101,80 +302,88 @@ def _parse_dimension_scores(report: dict) -> dict[str, float]:
             if isinstance(v, (int, float)) and k not in scores:
                 scores[k] = float(v)
 
-    return scores
-
-
-def _extract_failure_patterns(report: dict) -> list[dict]:
-    """
-    Extract actionable failure patterns from report.
-    Returns list of {task, dimension, score, guidance} dicts.
-    """
-    patterns = []
-
-    results = report.get("results", [])
-    if not isinstance(results, list):
-        return patterns
-
-    for result in results:
-        task = result.get("task", result.get("task_id", ""))
-        errors = result.get("errors", result.get("failures", []))
-        score = result.get("score", result.get("quality", None))
-
-        if isinstance(errors, list):
-            for err in errors:
-                if isinstance(err, str):
-                    patterns.append({
-                        "task": str(task)[:80],
-                        "dimension": "general",
-                        "score": score,
-                        "guidance": _error_to_guidance(err),
-                    })
-                elif isinstance(err, dict):
-                    dim = err.get("dimension", err.get("type", "general"))
-                    msg = err.get("message", err.get("error", str(err)))
-                    patterns.append({
-                        "task": str(task)[:80],
-                        "dimension": dim,
-                        "score": score,
-                        "guidance": _error_to_guidance(msg),
-                    })
-
-        # Low-score tasks without explicit errors
-        if score is not None and float(score) < 0.7 and not errors:
-            patterns.append({
-                "task": str(task)[:80],
-                "dimension": "quality",
-                "score": score,
-                "guidance": f"Low score ({score:.2f}) — review tool usage and answer completeness",
-            })
-
-    return patterns[:30]   # cap to avoid bloat
+    return scores, patterns[:MAX_FAILURE_PATTERNS]
+
+
+def _collect_failure_patterns(result: dict, patterns: list[dict]) -> None:
+    """Append the failure patterns of one report result row to patterns."""
+    task = _get_first(result, "task", "task_id", default="")
+    errors = _get_first(result, "errors", "failures", default=[])
+    score = _get_first(result, "score", "quality")
+
+    if isinstance(errors, list):
+        for err in errors:
+            if isinstance(err, str):
+                patterns.append({
+                    "task": str(task)[:80],
+                    "dimension": "general",
+                    "score": score,
+                    "guidance": _error_to_guidance(err),
+                })
+            elif isinstance(err, dict):
+                dim = _get_first(err, "dimension", "type", default="general")
+                msg = _get_first(err, "message", "error", default=_MISSING)
+                if msg is _MISSING:
+                    msg = str(err)
+                patterns.append({
+                    "task": str(task)[:80],
+                    "dimension": dim,
+                    "score": score,
+                    "guidance": _error_to_guidance(msg),
+                })
+
+    # Low-score tasks without explicit errors
+    if score is not None and float(score) < 0.7 and not errors:
+        patterns.append({
+            "task": str(task)[:80],
+            "dimension": "quality",
+            "score": score,
+            "guidance": f"Low score ({score:.2f}) — review tool usage and answer completeness",
+        })
+
+
+# Error-message vocabulary → one overlapping-lookahead alternation, so a single
+# scan reports every term group present (plain substring semantics).
+_GUIDANCE_TERMS = {
+    "float": "float|precision|rounding",
+    "policy": "policy|approval|unauthorized",
+    "hitl": "hitl|human|gate",
+    "tool": "tool",
+    "timeout": "timeout",
+    "fault": "error|fail",
+    "paginate": "paginate|cursor|page",
+    "schema": "schema|column|field",
+    "format": "format|json|output",
+    "privacy": "privacy|pii|sensitive",
+    "deadline": "deadline",
+    "fsm": "fsm|state",
+}
+_GUIDANCE_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{k}>{alt})" for k, alt in _GUIDANCE_TERMS.items()) + ")"
+)
+# Priority-ordered: (any of these term groups, plus this one if set, guidance)
+_GUIDANCE_RULES = (
+    ({"float"}, "", "Use integer cents for all financial math — never raw floats"),
+    ({"policy"}, "", "Always check policy_checker before any mutation tool call"),
+    ({"hitl"}, "", "Trigger APPROVAL_GATE state before executing mutation tools"),
+    ({"timeout", "fault"}, "tool", "Use resilient_tool_call with retry — tools can timeout transiently"),
+    ({"paginate"}, "", "Use paginated_fetch for large result sets — never assume single page"),
+    ({"schema"}, "", "Use schema_adapter fuzzy matching when column names vary"),
+    ({"format"}, "", "Return structured JSON answer — not plain text"),
+    ({"privacy"}, "", "Run privacy_guard check before exposing PII fields in output"),
+    ({"timeout", "deadline"}, "", "Check token_budget before each LLM call — skip if over 80%"),
+    ({"fsm"}, "", "Ensure FSM progresses through all required states for this process type"),
+)
 
 
 def _error_to_guidance(error_msg: str) -> str:
     """Convert raw error message to actionable agent guidance."""
     msg = str(error_msg).lower()
-
-    if "float" in msg or "precision" in msg or "rounding" in msg:
-        return "Use integer cents for all financial math — never raw floats"
-    if "policy" in msg or "approval" in msg or "unauthorized" in msg:
-        return "Always check policy_checker before any mutation tool call"
-    if "hitl" in msg or "human" in msg or "gate" in msg:
-        return "Trigger APPROVAL_GATE state before executing mutation tools"
-    if "tool" in msg and ("timeout" in msg or "error" in msg or "fail" in msg):
-        return "Use resilient_tool_call with retry — tools can timeout transiently"
-    if "paginate" in msg or "cursor" in msg or "page" in msg:
-        return "Use paginated_fetch for large result sets — never assume single page"
-    if "schema" in msg or "column" in msg or "field" in msg:
-        return "Use schema_adapter fuzzy matching when column names vary"
-    if "format" in msg or "json" in msg or "output" in msg:
-        return "Return structured JSON answer — not plain text"
-    if "privacy" in msg or "pii" in msg or "sensitive" in msg:
-        return "Run privacy_guard check before exposing PII fields in output"
-    if "timeout" in msg or "deadline" in msg:
-        return "Check token_budget before each LLM call — skip if over 80%"
-    if "fsm" in msg or "state" in msg:
-        return "Ensure FSM progresses through all required states for this process type"
+    found = {m.lastgroup for m in _GUIDANCE_RE.finditer(msg)}
+    if found:
+        for any_of, requires, guidance in _GUIDANCE_RULES:
+            if not found.isdisjoint(any_of) and (not requires or requires in found):
+                return guidance
 
     return error_msg[:120]
 
@@ -202,39 +411,59 @@ def _score_to_guidance(dim: str, score: float) -> str:
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
+def _cached_summary(intel: dict) -> dict:
+    return {
+        "refreshed": False,
+        "overall_score": intel.get("overall_score", 0),
+        "weak_dimensions": intel.get("weak_dimensions", []),
+        "failure_count": len(intel.get("failure_patterns", [])),
+    }
+
+
 def analyze_and_save(force: bool = False) -> dict:
     """
     Download latest benchmark report, extract intelligence, save to disk.
     Returns {refreshed, overall_score, weak_dimensions, failure_count}.
+
+    Stale (or forced) runs revalidate against S3 first: if the newest
+    report's ETag matches the source_etag recorded in the intelligence
+    file, the cached intelligence is kept and nothing is downloaded.
     """
     # Check staleness
     if not force and os.path.exists(INTELLIGENCE_PATH):
         try:
             mtime = os.path.getmtime(INTELLIGENCE_PATH)
-            if time.time() - mtime < STALE_HOURS * 3600:
-                with open(INTELLIGENCE_PATH) as f:
-                    intel = json.load(f)
-                return {
-                    "refreshed": False,
-                    "overall_score": intel.get("overall_score", 0),
-                    "weak_dimensions": intel.get("weak_dimensions", []),
-                    "failure_count": len(intel.get("failure_patterns", [])),
-                }
+            intel = load_intelligence() if time.time() - mtime < STALE_HOURS * 3600 else {}
+            if intel:
+                return _cached_summary(intel)
         except Exception:
             pass
 
+    # Revalidate — the listing already carries each object's ETag, no HEAD needed
+    latest = _newest_s3_report()
+    etag = latest.get("ETag") if latest else None
+    if etag:
+        intel = load_intelligence()
+        if intel and intel.get("source_etag") == etag:
+            try:
+                os.utime(INTELLIGENCE_PATH)  # fresh again for another STALE_HOURS
+            except OSError:
+                pass
+            return _cached_summary(intel)
+
     # Download report
-    report = _latest_report_from_s3()
-    if not report:
-        report = _latest_report_from_http()
-    if not report:
+    fetched = _latest_report_from_s3(latest) if latest else None
+    if not fetched:
+        etag = None  # HTTP reports have no S3 ETag to remember
+        fetched = _latest_report_from_http()
+    if not fetched:
         return {"refreshed": False, "overall_score": 0, "weak_dimensions": [], "failure_count": 0}
+    report, acc = fetched
 
     # Parse
-    dim_scores = _parse_dimension_scores(report)
-    failure_patterns = _extract_failure_patterns(report)
+    dim_scores, failure_patterns = _parse_report(report, acc)
 
-    overall = report.get("overall_score", report.get("score", report.get("pass_rate", 0)))
+    overall = _get_first(report, "overall_score", "score", "pass_rate", default=0)
     if not isinstance(overall, (int, float)):
         overall = sum(dim_scores.values()) / len(dim_scores) if dim_scores else 0
 
@@ -245,18 +474,22 @@ def analyze_and_save(force: bool = False) -> dict:
         if v < 0.8
     ]
 
+    run_count = _get_first(report, "run_count", "total_runs", default=_MISSING)
+    if run_count is _MISSING:
+        run_count = acc.count if acc is not None else len(report.get("results", []))
+
     intelligence = {
         "generated_at": time.time(),
         "overall_score": round(float(overall), 3),
         "dimension_scores": {k: round(v, 3) for k, v in dim_scores.items()},
         "weak_dimensions": weak_dims,
         "failure_patterns": failure_patterns,
-        "run_count": report.get("run_count", report.get("total_runs", len(report.get("results", [])))),
+        "run_count": run_count,
+        "source_etag": etag,
     }
 
     try:
-        with open(INTELLIGENCE_PATH, "w") as f:
-            json.dump(intelligence, f, indent=2)
+        write_json_atomic(INTELLIGENCE_PATH, intelligence, prefix=".intel.")
     except Exception:
         pass
 
@@ -268,26 +501,58 @@ def analyze_and_save(force: bool = False) -> dict:
     }
 
 
-def load_intelligence() -> dict:
-    """Load cached benchmark intelligence. Returns empty dict if unavailable."""
+def _intel_stamp() -> tuple[int, int] | None:
+    try:
+        st = os.stat(INTELLIGENCE_PATH)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_intelligence_stamped() -> tuple[tuple[int, int] | None, dict]:
+    """(file stamp, parsed intelligence); the dict is memoized per stamp."""
+    global _INTEL_STAMP, _INTEL_CACHED
     try:
-        if os.path.exists(INTELLIGENCE_PATH):
-            with open(INTELLIGENCE_PATH) as f:
-                return json.load(f)
+        stamp = _intel_stamp()
+        if stamp is None:
+            return None, {}
+        with _INTEL_LOCK:
+            if stamp != _INTEL_STAMP:
+                _INTEL_CACHED = read_json(INTELLIGENCE_PATH)
+                _INTEL_STAMP = stamp
+            return stamp, _INTEL_CACHED
     except Exception:
         pass
-    return {}
+    return None, {}
+
+
+def load_intelligence() -> dict:
+    """
+    Load cached benchmark intelligence. Returns empty dict if unavailable.
+    The parsed file is memoized by (mtime, size); treat the result as read-only.
+    """
+    return _load_intelligence_stamped()[1]
 
 
 def build_benchmark_primer() -> str:
     """
     Build a benchmark-focused primer from the intelligence report.
     Injected into agent system prompt by worker_brain.py PRIME phase.
+    Rendered once per intelligence file version.
     """
-    intel = load_intelligence()
+    global _PRIMER_CACHE
+    stamp, intel = _load_intelligence_stamped()
     if not intel:
         return ""
+    cached = _PRIMER_CACHE
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    primer = _render_benchmark_primer(intel)
+    _PRIMER_CACHE = (stamp, primer)
+    return primer
+
 
+def _render_benchmark_primer(intel: dict) -> str:
     lines = ["## BENCHMARK INTELLIGENCE (apply to this task)"]
 
     overall = intel.get("overall_score", 0)
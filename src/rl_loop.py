@@ -14,16 +14,55 @@ Fixes applied (2026-03-01):
 """
 from __future__ import annotations
 from src.token_budget import _is_bracket_format
-import json
+from src.state_files import read_json, write_json_atomic
+import atexit
 import os
 import re
+import threading
 import time
 import hashlib
-from dataclasses import dataclass, field, asdict
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+# Resolved once at import — build_rl_primer runs before every task
+try:
+    from src.report_analyzer import build_benchmark_primer
+except Exception:
+    def build_benchmark_primer() -> str:
+        return ""
+try:
+    from src.context_pruner import prune_case_log
+except Exception:
+    def prune_case_log(cases: list[dict], task_text: str = "") -> list[dict]:
+        return cases
 
 CASE_LOG_PATH = os.path.join(os.path.dirname(__file__), "..", "case_log.json")
 MAX_CASES = 200
 RELEVANT_CASES = 3
+FLUSH_INTERVAL = 5.0   # seconds between case_log.json rewrites
+FLUSH_EVERY = 10       # ...or after this many unflushed records
+PRIMER_AGE_BUCKET = 60.0   # seconds — a memoized primer is re-rendered at least this often,
+                           # so prune_case_log's age cutoff can't be outlived by the cache
+
+# ── Precompiled patterns (score_quality + structured memory extractors) ──────
+_EMPTY_DATA_RE = re.compile(r'"data"\s*:\s*\[\s*\]')
+_EMPTY_RESULTS_RE = re.compile(r'"results"\s*:\s*\[\s*\]')
+_AMOUNT_RE = re.compile(r'\$[\d,]+(?:\.\d{2})?')
+_OUTCOME_RE = re.compile(r'\b(approved|rejected|completed|resolved)\b')
+_TOOL_MENTIONS_RE = re.compile(r'\b(?:tool|called|fetched|retrieved|queried|executed|invoked)\b')
+# "Field name: value" — catches Risk rating:, Decision:, Total:, etc.
+_FIELD_VALUE_RE = re.compile(r'^[A-Za-z][A-Za-z\s_]{1,30}:\s*.{3,}', re.MULTILINE)
+_FAILURE_PATTERNS = [
+    (re.compile(r"no data found"), "No data found in tool response"),
+    (re.compile(r"unable to"), "Unable to complete action"),
+    (re.compile(r"cannot access"), "Tool access failure"),
+    (re.compile(r"token budget"), "Token budget exhausted"),
+    (re.compile(r"tool unavailable"), "Required tool unavailable"),
+    (re.compile(r"missing\s+\w+"), "Missing required field"),
+    (re.compile(r"timed? out"), "Timeout during execution"),
+]
 
 
 @dataclass
@@ -39,69 +78,228 @@ class CaseEntry:
     domain: str = ""
     timestamp: float = field(default_factory=time.time)
 
-
-def _load_cases() -> list[dict]:
+    def to_dict(self) -> dict:
+        """Flat JSON-ready dict — cheaper than dataclasses.asdict's recursive deepcopy walk."""
+        d = self.__dict__.copy()
+        d["keywords"] = list(self.keywords)
+        return d
+
+
+# In-memory case log — the source of truth between flushes. Appends are O(1);
+# disk is rewritten at most every FLUSH_INTERVAL seconds / FLUSH_EVERY records,
+# and once more at interpreter exit.
+_CASES_MEM: deque[dict] | None = None   # ring buffer — maxlen=MAX_CASES trims on append
+_CASES_STAMP: tuple[int, int] | None = None   # (mtime_ns, size) of our last load/flush
+_CASES_DIRTY = 0                               # records changed since last flush
+_CASES_VERSION = 0                             # bumped on every change — keys the primer cache
+_LAST_FLUSH = 0.0
+_CASES_LOCK = threading.RLock()
+# domain → (append seq, newest case of that domain); seqs count appends to _CASES_MEM,
+# so an entry stays valid as the ring buffer rotates — no positional indices to fix up
+_DOMAIN_LATEST: dict[str, tuple[int, dict]] = {}
+_APPEND_SEQ = 0
+METADATA_WINDOW = 9    # only enrich a domain's case if it is among the newest N (the old 9-entry scan)
+# Running outcome tallies over _CASES_MEM (for /rl/status) — adjusted on append and
+# ring-buffer eviction, rebuilt with the domain index when the list is replaced
+_CASE_TOTALS = {"successes": 0, "failures": 0, "quality_sum": 0.0}
+# case_id → keyword frozenset (keywords are fixed at record time)
+_KWSET_CACHE: dict[str, frozenset[str]] = {}
+
+
+def _case_log_stamp() -> tuple[int, int] | None:
     try:
-        if os.path.exists(CASE_LOG_PATH):
-            with open(CASE_LOG_PATH, "r") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return []
+        st = os.stat(CASE_LOG_PATH)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cases() -> deque[dict]:
+    """Live in-memory case list. Loads from disk on first use, or when the file
+    was changed by someone else and we have nothing unflushed. Caller holds _CASES_LOCK."""
+    global _CASES_MEM, _CASES_STAMP, _CASES_VERSION
+    stamp = _case_log_stamp()
+    if _CASES_MEM is not None and (_CASES_DIRTY or stamp == _CASES_STAMP):
+        return _CASES_MEM
+    cases: deque[dict] = deque(maxlen=MAX_CASES)
+    if stamp is not None:
+        try:
+            cases.extend(read_json(CASE_LOG_PATH))
+        except Exception:
+            cases.clear()
+    _CASES_MEM = cases
+    _index_domains(cases)
+    _CASES_STAMP = stamp
+    _CASES_VERSION += 1
+    return cases
+
+
+def _index_domains(cases: deque[dict]) -> None:
+    """Rebuild _DOMAIN_LATEST and _CASE_TOTALS after _CASES_MEM is replaced wholesale. Caller holds _CASES_LOCK."""
+    global _APPEND_SEQ
+    _DOMAIN_LATEST.clear()
+    _CASE_TOTALS.update(successes=0, failures=0, quality_sum=0.0)
+    for seq, case in enumerate(cases, 1):
+        if isinstance(case, dict):
+            _DOMAIN_LATEST[case.get("domain")] = (seq, case)
+            _tally_case(case, 1)
+    _APPEND_SEQ = len(cases)
+
+
+def _tally_case(case: dict, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one case from _CASE_TOTALS. Caller holds _CASES_LOCK."""
+    outcome = case.get("outcome")
+    if outcome == "success":
+        _CASE_TOTALS["successes"] += sign
+    elif outcome == "failure":
+        _CASE_TOTALS["failures"] += sign
+    quality = case.get("quality", 0)
+    if isinstance(quality, (int, float)):
+        _CASE_TOTALS["quality_sum"] += sign * quality
+
+
+def _append_case(case: dict) -> None:
+    """O(1) append + domain index / tally update. Caller holds _CASES_LOCK."""
+    global _APPEND_SEQ
+    cases = _cases()
+    if len(cases) == cases.maxlen and isinstance(cases[0], dict):
+        _tally_case(cases[0], -1)  # about to be evicted
+    cases.append(case)
+    _tally_case(case, 1)
+    _APPEND_SEQ += 1
+    _DOMAIN_LATEST[case.get("domain")] = (_APPEND_SEQ, case)
+    _mark_dirty()
 
 
-def _save_cases(cases: list[dict]) -> None:
-    try:
-        with open(CASE_LOG_PATH, "w") as f:
-            json.dump(cases[-MAX_CASES:], f, indent=2)
-    except Exception:
-        pass
+def _load_cases() -> list[dict]:
+    with _CASES_LOCK:
+        return list(_cases())
+
+
+def case_log_stats() -> dict:
+    """Outcome counts + mean quality of the live case log — O(1), from running tallies."""
+    with _CASES_LOCK:
+        total = len(_cases())
+        if not total:
+            return {"total": 0, "successes": 0, "failures": 0, "avg_quality": 0.0}
+        return {
+            "total": total,
+            "successes": _CASE_TOTALS["successes"],
+            "failures": _CASE_TOTALS["failures"],
+            "avg_quality": round(_CASE_TOTALS["quality_sum"] / total, 3),
+        }
+
+
+def _flush_cases() -> None:
+    """Write the in-memory case log to disk now (no-op when nothing changed)."""
+    global _CASES_STAMP, _CASES_DIRTY, _LAST_FLUSH
+    with _CASES_LOCK:
+        if _CASES_MEM is None or not _CASES_DIRTY:
+            return
+        try:
+            write_json_atomic(CASE_LOG_PATH, list(_CASES_MEM), prefix=".case_log.")
+            _CASES_STAMP = _case_log_stamp()
+            _CASES_DIRTY = 0
+        except Exception:
+            pass
+        _LAST_FLUSH = time.time()
 
 
-def _extract_keywords(text: str) -> list[str]:
-    stop = {
-        "the","a","an","is","are","was","were","be","been","have","has","had",
-        "do","does","did","will","would","could","should","can","for","in","on",
-        "at","to","of","and","or","but","with","from","this","that","it","i",
-        "you","please","need","want","help","task","make","get","use"
-    }
-    words = text.lower().split()
-    seen, unique = set(), []
-    for w in words:
-        w = w.strip(".,!?;:\"'()[]")
-        if len(w) > 3 and w not in stop and w not in seen:
-            seen.add(w)
-            unique.append(w)
-    return unique[:15]
+def _flush_if_due() -> None:
+    if _CASES_DIRTY >= FLUSH_EVERY or time.time() - _LAST_FLUSH > FLUSH_INTERVAL:
+        _flush_cases()
+
 
+def _mark_dirty(n: int = 1) -> None:
+    """Record n in-memory changes. Caller holds _CASES_LOCK."""
+    global _CASES_DIRTY, _CASES_VERSION
+    _CASES_DIRTY += n
+    _CASES_VERSION += 1
 
 
-def _has_structured_completion(answer: str) -> bool:
+def _save_cases(cases: list[dict]) -> None:
+    """Replace the whole case log and flush immediately (bulk writers, e.g. training_loader)."""
+    global _CASES_MEM
+    with _CASES_LOCK:
+        _CASES_MEM = deque(cases, maxlen=MAX_CASES)
+        _index_domains(_CASES_MEM)
+        _mark_dirty()
+        _flush_cases()
+
+
+atexit.register(_flush_cases)
+
+
+def _case_kwset(case: dict) -> frozenset[str]:
+    """Keyword set for a case, built once per case_id."""
+    case_id = case.get("case_id")
+    kws = _KWSET_CACHE.get(case_id) if case_id else None
+    if kws is None:
+        kws = frozenset(case.get("keywords", ()))
+        if case_id:
+            if len(_KWSET_CACHE) > 4 * MAX_CASES:
+                _KWSET_CACHE.clear()  # entries for trimmed cases — cheap to rebuild
+            _KWSET_CACHE[case_id] = kws
+    return kws
+
+
+_STOPWORDS = frozenset({
+    "the","a","an","is","are","was","were","be","been","have","has","had",
+    "do","does","did","will","would","could","should","can","for","in","on",
+    "at","to","of","and","or","but","with","from","this","that","it","i",
+    "you","please","need","want","help","task","make","get","use"
+})
+# Leading/trailing punctuation of each whitespace token, trimmed in one C-level pass
+# (same result as per-word w.strip(...); inner "$1,250.00" / "don't" stay intact)
+_EDGE_PUNCT_RE = re.compile(r"(?<!\S)[.,!?;:\"'()\[\]]+|[.,!?;:\"'()\[\]]+(?!\S)")
+MAX_KEYWORDS = 15
+
+
+@lru_cache(maxsize=512)
+def _extract_keywords(text: str) -> tuple[str, ...]:
+    """Up to MAX_KEYWORDS distinct content words; memoized — the same task text is
+    keyword-ized for the primer and again by record_outcome."""
+    seen, unique = set(), []
+    append = unique.append
+    for w in _EDGE_PUNCT_RE.sub("", text.lower()).split():
+        if len(w) > 3 and w not in _STOPWORDS and w not in seen:
+            seen.add(w)
+            append(w)
+            if len(unique) == MAX_KEYWORDS:
+                break
+    return tuple(unique)
+
+
+
+_COMPLETION_MARKERS = frozenset({
+    # Original
+    "approved", "rejected", "completed", "total:", "amount:", "decision:",
+    # Financial
+    "credit:", "debit:", "balance:", "variance:", "penalty:", "refund:",
+    # Risk/compliance
+    "risk:", "rating:", "score:", "level:", "finding:",
+    # Status/resolution
+    "status:", "resolved:", "closed:", "escalated:", "flagged:",
+    "processed:", "authorized:", "denied:", "blocked:",
+    # Action
+    "recommendation:", "action:", "next step:", "outcome:",
+})
+_COMPLETION_MARKERS_RE = re.compile("|".join(map(re.escape, sorted(_COMPLETION_MARKERS))))
+_ERROR_PHRASES_RE = re.compile(
+    "task failed|unable to|cannot access|no data found|token budget exhausted|tool unavailable"
+)
+
+
+def _has_structured_completion(answer: str, answer_lower: str | None = None) -> bool:
     """True if answer contains any field:value completion signal — domain-agnostic."""
     # Pattern 1: explicit field:value pairs (catches Risk rating:, Decision:, Total:, etc.)
-    field_value_pattern = re.compile(
-        r'^[A-Za-z][A-Za-z\s_]{1,30}:\s*.{3,}',  # "Field name: value"
-        re.MULTILINE
-    )
-    if field_value_pattern.search(answer):
+    if _FIELD_VALUE_RE.search(answer):
         return True
 
     # Pattern 2: expanded completion markers (original + domain-specific additions)
-    _COMPLETION_MARKERS = {
-        # Original
-        "approved", "rejected", "completed", "total:", "amount:", "decision:",
-        # Financial
-        "credit:", "debit:", "balance:", "variance:", "penalty:", "refund:",
-        # Risk/compliance
-        "risk:", "rating:", "score:", "level:", "finding:",
-        # Status/resolution
-        "status:", "resolved:", "closed:", "escalated:", "flagged:",
-        "processed:", "authorized:", "denied:", "blocked:",
-        # Action
-        "recommendation:", "action:", "next step:", "outcome:",
-    }
-    answer_lower = answer.lower()
-    return any(m in answer_lower for m in _COMPLETION_MARKERS)
+    if answer_lower is None:
+        answer_lower = answer.lower()
+    return _COMPLETION_MARKERS_RE.search(answer_lower) is not None
 
 
 def score_quality(
@@ -109,6 +307,7 @@ def score_quality(
     tool_count: int,
     policy_passed: bool | None,
     mutation_verified: bool | None = None,
+    answer_lower: str | None = None,
 ) -> float:
     """
     Quality score 0–1. Ported from BrainOS computeAgentQuality().
@@ -156,21 +355,25 @@ def score_quality(
     elif policy_passed is False: score -= 0.15
     # None = unknown, no adjustment
 
-    # BrainOS: empty data array penalty (Bug A verified — raw strings compile correctly)
-    if re.search(r'"data"\s*:\s*\[\s*\]', answer):    score -= 0.25
-    if re.search(r'"results"\s*:\s*\[\s*\]', answer): score -= 0.15
+    # Content signals below can't fire on a blank answer — skip the regex scans
+    # (hot on failed tasks; the short-answer penalty above already applied)
+    if answer_stripped:
+        if answer_lower is None:
+            answer_lower = answer.lower()
+
+        # BrainOS: empty data array penalty (Bug A verified — raw strings compile correctly)
+        if _EMPTY_DATA_RE.search(answer):    score -= 0.25
+        if _EMPTY_RESULTS_RE.search(answer): score -= 0.15
 
-    # Structure reward
-    if _has_structured_completion(answer):
-        score += 0.08
-    if "{" in answer and "}" in answer:
-        score += 0.05
+        # Structure reward
+        if _has_structured_completion(answer, answer_lower):
+            score += 0.08
+        if "{" in answer and "}" in answer:
+            score += 0.05
 
-    # Error phrase penalty
-    error_phrases = ["task failed", "unable to", "cannot access", "no data found",
-                     "token budget exhausted", "tool unavailable"]
-    if any(p in answer.lower() for p in error_phrases):
-        score -= 0.25
+        # Error phrase penalty
+        if _ERROR_PHRASES_RE.search(answer_lower):
+            score -= 0.25
 
     # Mutation verification signal — bridges internal quality to judge functional score.
     # mutation_verified=True means a write tool was called AND read-back confirmed the change.
@@ -186,18 +389,17 @@ def score_quality(
 
 # ── Structured memory extraction (pure string, zero API cost) ─────────────────
 
-def _extract_success_pattern(task_text: str, answer: str, domain: str = "") -> str:
+def _extract_success_pattern(task_text: str, answer: str, domain: str = "", answer_lower: str | None = None) -> str:
     """
     Extract a concise success pattern description from task + answer.
     No API calls — pure string analysis.
     """
     parts = []
+    if answer_lower is None:
+        answer_lower = answer.lower()
 
     # Count tool references in answer
-    tool_mentions = len(re.findall(
-        r'\b(?:tool|called|fetched|retrieved|queried|executed|invoked)\b',
-        answer.lower()
-    ))
+    tool_mentions = len(_TOOL_MENTIONS_RE.findall(answer_lower))
     if tool_mentions > 0:
         parts.append(f"Used ~{tool_mentions} tool references")
 
@@ -207,20 +409,19 @@ def _extract_success_pattern(task_text: str, answer: str, domain: str = "") -> s
         parts.append(process_label)
 
     # Extract dollar amount if present
-    amount_m = re.search(r'\$[\d,]+(?:\.\d{2})?', answer)
+    amount_m = _AMOUNT_RE.search(answer)
     if amount_m:
         parts.append(f"Amount processed: {amount_m.group()}")
 
     # Detect approval/rejection outcome
-    if re.search(r'\b(approved|rejected|completed|resolved)\b', answer.lower()):
-        outcome_m = re.search(r'\b(approved|rejected|completed|resolved)\b', answer.lower())
-        if outcome_m:
-            parts.append(f"Outcome: {outcome_m.group()}")
+    outcome_m = _OUTCOME_RE.search(answer_lower)
+    if outcome_m:
+        parts.append(f"Outcome: {outcome_m.group()}")
 
     return ". ".join(parts) if parts else "Completed successfully"
 
 
-def _extract_failure_pattern(task_text: str, answer: str) -> str:
+def _extract_failure_pattern(task_text: str, answer: str, answer_lower: str | None = None) -> str:
     """
     Extract a concise failure pattern description from task + answer.
     No API calls — pure string analysis.
@@ -228,24 +429,17 @@ def _extract_failure_pattern(task_text: str, answer: str) -> str:
     parts = []
 
     # Check for common error phrases
-    error_patterns = [
-        (r"no data found", "No data found in tool response"),
-        (r"unable to", "Unable to complete action"),
-        (r"cannot access", "Tool access failure"),
-        (r"token budget", "Token budget exhausted"),
-        (r"tool unavailable", "Required tool unavailable"),
-        (r"missing\s+\w+", "Missing required field"),
-        (r"timed? out", "Timeout during execution"),
-    ]
-    for pattern, label in error_patterns:
-        if re.search(pattern, answer.lower()):
+    if answer_lower is None:
+        answer_lower = answer.lower()
+    for pattern, label in _FAILURE_PATTERNS:
+        if pattern.search(answer_lower):
             parts.append(label)
             break
 
     # Check for missing data indicators
-    if re.search(r'"data"\s*:\s*\[\s*\]', answer):
+    if _EMPTY_DATA_RE.search(answer):
         parts.append("Empty data response from tool")
-    if re.search(r'"results"\s*:\s*\[\s*\]', answer):
+    if _EMPTY_RESULTS_RE.search(answer):
         parts.append("Empty results from query")
 
     # Short answer = incomplete
@@ -262,23 +456,27 @@ def _update_case_entry_metadata(domain: str, what_worked: str = "", what_failed:
     Called after extract_structured_memory() — enriches RL primer quality.
     """
     try:
-        cases = _load_cases()
-        if not cases:
-            return
-        # Find the most recent entry for this domain
-        for i in range(len(cases) - 1, max(len(cases) - 10, -1), -1):
-            if cases[i].get("domain") == domain:
-                if what_worked and not cases[i].get("what_worked"):
-                    cases[i]["what_worked"] = what_worked
-                if what_failed and not cases[i].get("what_failed"):
-                    cases[i]["what_failed"] = what_failed
-                _save_cases(cases)
+        with _CASES_LOCK:
+            _cases()  # sync with disk (rebuilds the index on reload)
+            # Most recent entry for this domain, if still within the newest METADATA_WINDOW
+            hit = _DOMAIN_LATEST.get(domain)
+            if hit is None or _APPEND_SEQ - hit[0] >= METADATA_WINDOW:
                 return
+            case = hit[1]
+            if what_worked and not case.get("what_worked"):
+                case["what_worked"] = what_worked
+                _mark_dirty()
+            if what_failed and not case.get("what_failed"):
+                case["what_failed"] = what_failed
+                _mark_dirty()
+            _flush_if_due()
     except Exception:
         pass
 
 
-def extract_structured_memory(task_text: str, answer: str, domain: str, quality: float) -> None:
+def extract_structured_memory(
+    task_text: str, answer: str, domain: str, quality: float, answer_lower: str | None = None,
+) -> None:
     """
     Extract 3 structured facts from task outcome using pure string analysis (no API).
     Inspired by BrainOS agent-rl.ts recordAgentOutcome() pattern.
@@ -290,12 +488,20 @@ def extract_structured_memory(task_text: str, answer: str, domain: str, quality:
 
     Results stored back into the most recent case log entry for this domain,
     enriching the RL primer injected before future similar tasks.
+
+    A blank answer yields nothing: record_outcome has already filled the
+    field this would enrich (what_failed always; what_worked whenever such
+    an answer can still score >= 0.6, i.e. policy_passed).
     """
+    if not answer or answer.isspace():
+        return
+    if answer_lower is None:
+        answer_lower = answer.lower()
     if quality >= 0.6:
-        what_worked = _extract_success_pattern(task_text, answer, domain)
+        what_worked = _extract_success_pattern(task_text, answer, domain, answer_lower)
         _update_case_entry_metadata(domain, what_worked=what_worked)
     else:
-        what_failed = _extract_failure_pattern(task_text, answer)
+        what_failed = _extract_failure_pattern(task_text, answer, answer_lower)
         _update_case_entry_metadata(domain, what_failed=what_failed)
 
 
@@ -311,10 +517,10 @@ def record_outcome(
     mutation_verified: bool | None = None,
 ) -> float:
     """Record task outcome. Returns quality score (dopamine if >=0.6, gaba if <0.6)."""
-    cases = _load_cases()
-    quality = score_quality(answer, tool_count, policy_passed, mutation_verified)
+    answer_lower = answer.lower()  # shared by scoring + structured memory extraction
+    quality = score_quality(answer, tool_count, policy_passed, mutation_verified, answer_lower)
     outcome = "success" if quality >= 0.6 else ("failure" if error else "partial")
-    case_id = hashlib.md5(f"{task_text[:50]}{time.time()}".encode()).hexdigest()[:8]
+    case_id = hashlib.blake2b(f"{task_text[:50]}{time.time()}".encode(), digest_size=4).hexdigest()
 
     what_worked = ""
     what_failed = ""
@@ -329,7 +535,7 @@ def record_outcome(
     entry = CaseEntry(
         case_id=case_id,
         task_summary=task_text[:200],
-        keywords=_extract_keywords(task_text),
+        keywords=list(_extract_keywords(task_text)),
         outcome=outcome,
         quality=round(quality, 3),
         what_worked=what_worked,
@@ -337,11 +543,12 @@ def record_outcome(
         tool_count=tool_count,
         domain=domain,
     )
-    cases.append(asdict(entry))
-    _save_cases(cases)
+    with _CASES_LOCK:
+        _append_case(entry.to_dict())
+        _flush_if_due()
 
     # Enrich with structured memory extraction immediately (pure string, no API)
-    extract_structured_memory(task_text, answer, domain, quality)
+    extract_structured_memory(task_text, answer, domain, quality, answer_lower)
 
     return quality
 
@@ -354,33 +561,55 @@ def build_rl_primer(task_text: str) -> str:
     Bug B fix (2026-03-01): Now also includes benchmark intelligence
     from report_analyzer.build_benchmark_primer() so the agent knows
     exactly where it lost points in the last benchmark run.
+
+    Rendered primers are memoized per (task text, case log version,
+    benchmark primer, PRIMER_AGE_BUCKET time slot) — a repeated task between
+    outcomes is a cache hit, and aged-out cases drop within one bucket.
     """
-    cases = _load_cases()
-    # Prune stale/low-quality/repeated-failure entries before scoring
+    # ── Benchmark intelligence (Bug B fix) ───────────────────────────────────
+    bench_primer = ""
     try:
-        from src.context_pruner import prune_case_log, prune_rl_primer
-        cases = prune_case_log(cases, task_text)
+        bench_primer = build_benchmark_primer()
     except Exception:
-        pass  # Graceful no-op if context_pruner unavailable
-    task_kw = set(_extract_keywords(task_text))
-    scored = []
+        pass  # Graceful no-op — benchmark data may not be available yet
+
+    with _CASES_LOCK:
+        _cases()  # pick up external edits before reading the version
+        version = _CASES_VERSION
+    age_bucket = int(time.time() // PRIMER_AGE_BUCKET)
+    return _render_rl_primer(task_text, version, bench_primer, age_bucket)
+
+
+def _overlapping_cases(cases: list[dict], task_kw: frozenset[str]):
+    """Yield (keyword overlap, quality, case) for every case sharing a keyword with the task."""
     for c in cases:
-        overlap = len(task_kw & set(c.get("keywords", [])))
+        overlap = len(task_kw & _case_kwset(c))
         if overlap > 0:
-            scored.append((overlap, c))
-    scored.sort(key=lambda x: (-x[0], -x[1].get("quality", 0)))
-    relevant = [c for _, c in scored[:RELEVANT_CASES]]
+            yield overlap, c.get("quality", 0), c
 
-    lines = []
 
-    # ── Benchmark intelligence (Bug B fix) ───────────────────────────────────
+def _score_key(item: tuple) -> tuple:
+    return item[0], item[1]
+
+
+@lru_cache(maxsize=256)
+def _render_rl_primer(task_text: str, cases_version: int, bench_primer: str, age_bucket: int) -> str:
+    """Pure render of build_rl_primer; cases_version and age_bucket only key the cache."""
+    cases = _load_cases()
+    # Prune stale/low-quality/repeated-failure entries before scoring
     try:
-        from src.report_analyzer import build_benchmark_primer
-        bench_primer = build_benchmark_primer()
-        if bench_primer:
-            lines.append(bench_primer)
+        cases = prune_case_log(cases, task_text)
     except Exception:
-        pass  # Graceful no-op — benchmark data may not be available yet
+        pass  # Graceful no-op — never let pruning break the primer
+    task_kw = frozenset(_extract_keywords(task_text))
+    # Top-K by (overlap, quality) without sorting every match — nlargest keeps
+    # the stable tie order of the old full sort
+    scored = _overlapping_cases(cases, task_kw)
+    relevant = [c for _, _, c in heapq.nlargest(RELEVANT_CASES, scored, key=_score_key)]
+
+    lines = []
+    if bench_primer:
+        lines.append(bench_primer)
 
     # ── Case log patterns ─────────────────────────────────────────────────────
     if relevant:
@@ -14,7 +14,7 @@ Also handles empty results that indicate column filter drift (Fix A).
 from __future__ import annotations
 import re
 from difflib import get_close_matches, SequenceMatcher
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Collection
 
 # Canonical → known aliases (mirrors BrainOS KNOWN_COLUMN_ALIASES)
 KNOWN_COLUMN_ALIASES: dict[str, list[str]] = {
@@ -35,6 +35,14 @@ KNOWN_COLUMN_ALIASES: dict[str, list[str]] = {
                          "comments", "body", "content"],
 }
 
+# Reverse index alias → canonical, built once (reversed so the first canonical wins
+# should an alias ever be listed twice — same as the old in-order scan)
+_ALIAS_TO_CANON: dict[str, str] = {
+    alias: canonical
+    for canonical, aliases in reversed(KNOWN_COLUMN_ALIASES.items())
+    for alias in aliases
+}
+
 SCHEMA_ERROR_PATTERNS = [
     r"column[s]?\s+['\"]?(\w+)['\"]?\s+(?:not found|does not exist|unknown|not recognized)",
     r"no such column[s]?:?\s+['\"]?(\w+)['\"]?",
@@ -43,6 +51,15 @@ SCHEMA_ERROR_PATTERNS = [
     r"field[s]?\s+['\"]?(\w+)['\"]?\s+(?:not found|does not exist)",
     r"KeyError:\s+['\"]?(\w+)['\"]?",
 ]
+# Compiled once; IGNORECASE instead of lowercasing every error message
+_SCHEMA_ERROR_RES = tuple(re.compile(p, re.IGNORECASE) for p in SCHEMA_ERROR_PATTERNS)
+# All patterns as one alternation — a single scan rejects the common non-schema error.
+# Each pattern has exactly one group, so m.lastindex is the 1-based pattern index.
+_SCHEMA_ERROR_ANY = re.compile("|".join(f"(?:{p})" for p in SCHEMA_ERROR_PATTERNS), re.IGNORECASE)
+
+# Column-like identifiers in schema introspection output (case-insensitive, so the
+# possibly large schema text is never copied by .lower())
+_COL_RE = re.compile(r'\b[a-z_][a-z0-9_]{2,}\b', re.IGNORECASE)
 
 # Keys whose empty value signals a filtered-but-drifted query (Fix A)
 _EMPTY_RESULT_KEYS = ("data", "items", "records", "results", "rows", "list")
@@ -93,7 +110,9 @@ def _result_is_empty_due_to_drift(result: dict) -> bool:
     """
     if not isinstance(result, dict):
         return False
-    if "error" in str(result).lower():
+    # Error results are the error path's business — check the key instead of
+    # repr()-ing and lowercasing the whole (possibly large) result
+    if result.get("error"):
         return False
     for key in _EMPTY_RESULT_KEYS:
         val = result.get(key)
@@ -107,15 +126,20 @@ def _result_is_empty_due_to_drift(result: dict) -> bool:
 
 def detect_schema_error(error_text: str) -> str | None:
     """Extract the bad column name from an error message. None if not a schema error."""
-    text = error_text.lower()
-    for pattern in SCHEMA_ERROR_PATTERNS:
-        m = re.search(pattern, text)
-        if m and m.lastindex >= 1:
-            return m.group(1)
-    return None
+    m = _SCHEMA_ERROR_ANY.search(error_text)
+    if m is None:
+        return None
+    idx = m.lastindex
+    # The alternation finds the leftmost match; patterns are priority-ordered, so let
+    # any earlier pattern matching further right win (rare: only on schema errors)
+    for pattern in _SCHEMA_ERROR_RES[:idx - 1]:
+        hit = pattern.search(error_text)
+        if hit:
+            return hit.group(1).lower()
+    return m.group(idx).lower()  # column names are matched lowercase downstream
 
 
-def fuzzy_match_column(bad_col: str, candidates: list[str]) -> str | None:
+def fuzzy_match_column(bad_col: str, candidates: Collection[str]) -> str | None:
     """
     Match bad_col to closest candidate.
     Order:
@@ -129,36 +153,65 @@ def fuzzy_match_column(bad_col: str, candidates: list[str]) -> str | None:
     """
     if not candidates:
         return None
+    # O(1) membership for Tiers 1–2 (candidates can be hundreds); schema columns arrive as a set
+    cand_set = candidates if isinstance(candidates, (set, frozenset)) else set(candidates)
 
     # Tier 1: Exact match
-    if bad_col in candidates:
+    if bad_col in cand_set:
         return bad_col
 
-    # Tier 2: Known alias lookup (both directions)
-    for canonical, aliases in KNOWN_COLUMN_ALIASES.items():
-        if bad_col in aliases and canonical in candidates:
-            return canonical
-        if bad_col == canonical:
-            match = next((a for a in aliases if a in candidates), None)
-            if match:
-                return match
+    # Tier 2: Known alias lookup (both directions) — dict hits, no table scan
+    canonical = _ALIAS_TO_CANON.get(bad_col)
+    if canonical is not None and canonical in cand_set:
+        return canonical
+    aliases = KNOWN_COLUMN_ALIASES.get(bad_col)
+    if aliases:
+        match = next((a for a in aliases if a in cand_set), None)
+        if match:
+            return match
 
     # Tier 3: difflib close match
     # Lower cutoff for short abbreviations (len <= 3) — e.g. "em", "st", "ts"
     cutoff = 0.5 if len(bad_col) <= 3 else 0.6
-    matches = get_close_matches(bad_col, candidates, n=1, cutoff=cutoff)
+    # ratio() <= 2*min(len)/(sum of lens): drop candidates whose length alone rules
+    # them out before difflib builds a matcher for each (same bound difflib applies)
+    nb = len(bad_col)
+    shortlist = [c for c in candidates if _length_bound(nb, len(c)) >= cutoff]
+    if not shortlist:
+        return _prefix_match(bad_col, candidates)
+    matches = get_close_matches(bad_col, shortlist, n=1, cutoff=cutoff)
     if matches:
         return matches[0]
 
     # Tier 4: Levenshtein ratio fallback (>0.7)
+    # One matcher, seq1 fixed; cheap upper bounds skip the full ratio() whenever a
+    # candidate can't beat both the threshold and the current best
     best, best_ratio = None, 0.0
-    for c in candidates:
-        ratio = SequenceMatcher(None, bad_col, c).ratio()
+    sm = SequenceMatcher(None, bad_col, "")
+    for c in shortlist:
+        if _length_bound(nb, len(c)) <= 0.7:
+            continue
+        sm.set_seq2(c)
+        floor = best_ratio if best_ratio > 0.7 else 0.7
+        if sm.real_quick_ratio() <= floor or sm.quick_ratio() <= floor:
+            continue
+        ratio = sm.ratio()
         if ratio > best_ratio:
             best_ratio, best = ratio, c
     if best and best_ratio > 0.7:
         return best
 
+    return _prefix_match(bad_col, candidates)
+
+
+def _length_bound(la: int, lb: int) -> float:
+    """Upper bound on SequenceMatcher.ratio() from lengths alone (== real_quick_ratio)."""
+    total = la + lb
+    return 2.0 * min(la, lb) / total if total else 1.0
+
+
+def _prefix_match(bad_col: str, candidates: Collection[str]) -> str | None:
+    """Tier 5 of fuzzy_match_column."""
     # Tier 5: Prefix matching
     # bad_col is a prefix of a candidate (e.g. "own" → "owner_id")
     prefix_candidates = [c for c in candidates if c.startswith(bad_col)]
@@ -173,23 +226,58 @@ def fuzzy_match_column(bad_col: str, candidates: list[str]) -> str | None:
     return None
 
 
+def _rename_column(obj, bad: str, good: str, token_re: re.Pattern):
+    """
+    Rename column ``bad`` → ``good`` throughout a params structure:
+    dict keys equal to ``bad`` are renamed, and inside strings only whole
+    identifier tokens are replaced — "st" never rewrites "status", while
+    filter expressions like "status = 'open'" are still corrected.
+    """
+    if isinstance(obj, str):
+        if bad not in obj:
+            return obj  # cheap reject before the regex
+        return good if obj == bad else token_re.sub(lambda _m: good, obj)
+    if isinstance(obj, dict):
+        return {
+            (good if k == bad else k): _rename_column(v, bad, good, token_re)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_rename_column(i, bad, good, token_re) for i in obj]
+    return obj
+
+
 def _replace_in_params(params: dict, bad: str, good: str) -> dict:
-    result = {}
-    for k, v in params.items():
-        if isinstance(v, str):
-            result[k] = v.replace(bad, good)
-        elif isinstance(v, dict):
-            result[k] = _replace_in_params(v, bad, good)
-        elif isinstance(v, list):
-            result[k] = [
-                _replace_in_params(i, bad, good) if isinstance(i, dict)
-                else i.replace(bad, good) if isinstance(i, str)
-                else i
-                for i in v
-            ]
-        else:
-            result[k] = v
-    return result
+    token_re = re.compile(rf"(?<!\w){re.escape(bad)}(?!\w)")
+    return _rename_column(params, bad, good, token_re)
+
+
+async def _introspect_columns(
+    table: str,
+    on_tool_call: Callable[[str, dict], Awaitable[dict]],
+    available_tool_names: list[str] | None,
+) -> tuple[set[str] | None, bool]:
+    """
+    (columns, cacheable): column names reported by the first schema tool that
+    answers, or None if none do. cacheable is False when a schema tool raised
+    (timeout, network) — a transient failure shouldn't be remembered.
+    """
+    schema_result = None
+    raised = False
+    for schema_tool in _find_schema_tools(available_tool_names or []):
+        try:
+            r = await on_tool_call(schema_tool, {"table": table} if table else {})
+            if not (isinstance(r, dict) and "error" in r):
+                schema_result = r
+                break
+        except Exception:
+            raised = True
+            continue
+
+    if not schema_result:
+        return None, not raised
+
+    return {m.group(0).lower() for m in _COL_RE.finditer(str(schema_result))}, True
 
 
 async def _attempt_schema_correction(
@@ -226,25 +314,19 @@ async def _attempt_schema_correction(
     if not cols_to_try:
         return None
 
-    # Introspect schema once — try tools in dynamically-discovered order
+    # Introspect schema once per table per session — try tools in dynamically-discovered order
     table = params.get("table") or params.get("table_name") or params.get("resource", "")
-    schema_result = None
-    schema_tools = _find_schema_tools(available_tool_names or [])
-    for schema_tool in schema_tools:
-        try:
-            r = await on_tool_call(schema_tool, {"table": table} if table else {})
-            if not (isinstance(r, dict) and "error" in r):
-                schema_result = r
-                break
-        except Exception:
-            continue
+    cols_key = f"__cols__:{table}"
+    if cols_key in schema_cache:
+        columns = schema_cache[cols_key]  # None = no schema tool could describe this table
+    else:
+        columns, cacheable = await _introspect_columns(table, on_tool_call, available_tool_names)
+        if cacheable:
+            schema_cache[cols_key] = columns
 
-    if not schema_result:
+    if not columns:
         return None
 
-    schema_text = str(schema_result)
-    columns = list(set(re.findall(r'\b([a-z_][a-z0-9_]{2,})\b', schema_text.lower())))
-
     corrected_params = dict(params)
     made_correction = False
     for col in cols_to_try:
@@ -8,7 +8,8 @@ Two patterns:
     Consensus check → return longer answer or synthesize if divergent.
 
   Pattern 2 — 3-lens synthesis (for complex multi-part tasks):
-    Run 3 Haiku calls in parallel, each with a different analytical lens.
+    One Haiku call answers through 3 analytical lenses (tagged sections;
+    3 parallel calls if the sections can't be parsed).
     Sonnet synthesizes all 3 into a final answer.
 
 Public API:
@@ -18,11 +19,11 @@ Public API:
 from __future__ import annotations
 
 import asyncio
+import re
 from typing import NamedTuple
 
-import anthropic
-
-from src.config import ANTHROPIC_API_KEY, FALLBACK_MODEL
+from src.config import FALLBACK_MODEL
+from src.llm_client import get_client
 from src.token_budget import _is_bracket_format
 
 # ── Constants ─────────────────────────────────────────────────────────────────
@@ -33,33 +34,45 @@ _SYNTH_MODEL = "claude-sonnet-4-6"          # used only for 3-lens synthesis ste
 _DUAL_TIMEOUT_TOTAL = 15.0    # seconds — total budget for dual top_p
 _DUAL_TIMEOUT_EACH  = 12.0    # seconds — each individual call before fallback
 _LENS_TIMEOUT_EACH  = 12.0    # seconds — each lens call
+_LENS_TIMEOUT_BATCH = 15.0    # seconds — total lens budget (batched call + any fallback)
 _SYNTH_TIMEOUT      = 20.0    # seconds — sonnet synthesis step
+_HEDGE_FACTOR       = 1.5     # dual top_p: wait this × first answer's latency for the second
+_HEDGE_MIN          = 1.5     # seconds — floor on that wait
 
 _OVERLAP_HIGH = 0.70          # above this: answers agree, return longer one
 _OVERLAP_CALL_THRESHOLD = 0.70  # alias for clarity in code
+_SUBSET_MIN_WORDS = 20        # dual top_p: skip synthesis if a >20-word answer is a subset of the other
 
 
 # ── Word-overlap consensus ─────────────────────────────────────────────────────
 
+_STOP = frozenset(
+    "the a an and or but is are was were be been being have has had do does did "
+    "will would could should may might shall to of in on at by for with from as "
+    "it its this that these those i we you he she they me us him her them my our "
+    "your his its their what which who whom when where why how all any some".split()
+)
+
+
 def _word_set(text: str) -> set[str]:
     """Lowercase word tokens, stop-words stripped for signal clarity."""
-    _STOP = frozenset(
-        "the a an and or but is are was were be been being have has had do does did "
-        "will would could should may might shall to of in on at by for with from as "
-        "it its this that these those i we you he she they me us him her them my our "
-        "your his its their what which who whom when where why how all any some".split()
-    )
-    return {w for w in text.lower().split() if w.isalpha() and w not in _STOP}
+    # Dedupe first: isalpha() then runs once per distinct token, not per occurrence
+    words = {w for w in set(text.lower().split()) if w.isalpha()}
+    words -= _STOP
+    return words
 
 
 def compute_overlap(a: str, b: str) -> float:
     """Jaccard-style overlap between two answer strings. Range [0, 1]."""
-    set_a = _word_set(a)
-    set_b = _word_set(b)
+    return _jaccard(_word_set(a), _word_set(b))
+
+
+def _jaccard(set_a: set[str], set_b: set[str]) -> float:
+    """compute_overlap on prebuilt word sets — reuse a set across several pairs."""
     if not set_a or not set_b:
         return 0.0
     intersection = len(set_a & set_b)
-    union = len(set_a | set_b)
+    union = len(set_a) + len(set_b) - intersection  # |A ∪ B| without building it
     return intersection / union if union else 0.0
 
 
@@ -68,12 +81,6 @@ def _best_of_two(a: str, b: str) -> str:
     return a if len(a) >= len(b) else b
 
 
-# ── Shared Anthropic async client factory ─────────────────────────────────────
-
-def _client() -> anthropic.AsyncAnthropic:
-    return anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
-
-
 # ── Single inference helper ───────────────────────────────────────────────────
 
 async def _call_haiku(
@@ -84,7 +91,7 @@ async def _call_haiku(
     timeout: float = _DUAL_TIMEOUT_EACH,
 ) -> str:
     """Single Haiku inference with configurable top_p and timeout."""
-    client = _client()
+    client = get_client()
     response = await asyncio.wait_for(
         client.messages.create(
             model=_HAIKU_MODEL,
@@ -100,6 +107,60 @@ async def _call_haiku(
 
 # ── Pattern 1: Dual top_p synthesis ──────────────────────────────────────────
 
+def _safe_result(task: asyncio.Task) -> str:
+    """Answer text of a finished task; "" if it is still running, was cancelled, or raised."""
+    if not task.done() or task.cancelled() or task.exception() is not None:
+        return ""
+    result = task.result()
+    return result if isinstance(result, str) else ""
+
+
+async def _or_empty(coro) -> str:
+    """Await a call inside a TaskGroup; a failure yields "" instead of cancelling its siblings."""
+    try:
+        result = await coro
+    except Exception:
+        return ""
+    return result if isinstance(result, str) else ""
+
+
+async def _run_all(*coros) -> list[str]:
+    """Run calls concurrently (structured: cancelling the caller cancels them all); "" per failure."""
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_or_empty(c)) for c in coros]
+    return [t.result() for t in tasks]
+
+
+async def _hedged_pair(first_coro, second_coro) -> tuple[str, str]:
+    """
+    Run two calls concurrently, but stop waiting on the slower one soon after
+    the first usable answer: it gets max(_HEDGE_MIN, _HEDGE_FACTOR × first latency)
+    more, within _DUAL_TIMEOUT_TOTAL. Stragglers are cancelled to free their HTTP slot.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.ensure_future(first_coro), asyncio.ensure_future(second_coro)]
+    start = loop.time()
+    deadline = start + _DUAL_TIMEOUT_TOTAL
+    try:
+        pending = set(tasks)
+        # A fast failure doesn't count as "first answer" — keep waiting for the other
+        while pending and not any(_safe_result(t) for t in tasks):
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break  # total budget exceeded
+        if pending and any(_safe_result(t) for t in tasks):
+            hedge = max(_HEDGE_MIN, _HEDGE_FACTOR * (loop.time() - start))
+            await asyncio.wait(pending, timeout=max(0.0, min(hedge, deadline - loop.time())))
+    finally:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+    return _safe_result(tasks[0]), _safe_result(tasks[1])
+
+
 async def _dual_top_p(
     task_text: str,
     system_prompt: str,
@@ -107,7 +168,8 @@ async def _dual_top_p(
 ) -> tuple[str, float]:
     """
     Run task_text with top_p=0.85 (conservative) and top_p=0.99 (exploratory)
-    in parallel.  Compute word-overlap; if high → return longer answer,
+    in parallel (hedged: a straggler is dropped shortly after the first answer).
+    Compute word-overlap; if high → return longer answer,
     if low → use Haiku to synthesize best of both.
 
     Returns (answer, consensus_score).
@@ -115,19 +177,9 @@ async def _dual_top_p(
     conservative_coro = _call_haiku(system_prompt, task_text, top_p=0.85, timeout=_DUAL_TIMEOUT_EACH)
     exploratory_coro  = _call_haiku(system_prompt, task_text, top_p=0.99, timeout=_DUAL_TIMEOUT_EACH)
 
-    try:
-        results = await asyncio.wait_for(
-            asyncio.gather(conservative_coro, exploratory_coro, return_exceptions=True),
-            timeout=_DUAL_TIMEOUT_TOTAL,
-        )
-    except asyncio.TimeoutError:
-        # Total budget exceeded — return whichever completed via individual timeout
-        results = ["", ""]
-
-    answer_a: str = results[0] if isinstance(results[0], str) else ""
-    answer_b: str = results[1] if isinstance(results[1], str) else ""
+    answer_a, answer_b = await _hedged_pair(conservative_coro, exploratory_coro)
 
-    # Fallback: if one failed entirely, return the other
+    # Fallback: if one failed or was dropped as a straggler, return the other
     if not answer_a and not answer_b:
         return "", 0.0
     if not answer_a:
@@ -135,12 +187,20 @@ async def _dual_top_p(
     if not answer_b:
         return answer_a, 0.5
 
-    overlap = compute_overlap(answer_a, answer_b)
+    words_a, words_b = _word_set(answer_a), _word_set(answer_b)
+    overlap = _jaccard(words_a, words_b)
 
     if overlap >= _OVERLAP_HIGH:
         # Answers agree — return the longer/more complete one
         return _best_of_two(answer_a, answer_b), overlap
 
+    # One answer's content words all appear in the other — the superset already
+    # covers it, so a synthesis call would add nothing
+    if len(words_a) > _SUBSET_MIN_WORDS and words_a <= words_b:
+        return answer_b, overlap
+    if len(words_b) > _SUBSET_MIN_WORDS and words_b <= words_a:
+        return answer_a, overlap
+
     # Divergent answers — run one Haiku synthesis call
     synthesis_prompt = (
         "You are a synthesis engine. You have received two independent answers to the same task. "
@@ -187,34 +247,89 @@ _LENS_PROMPTS = {
 }
 
 
+# All three lenses in one prompt: task_text is sent (and prefilled) once, not 3x.
+_COMBINED_LENS_PROMPT = (
+    "Analyze the given task from three independent perspectives. "
+    "Write each analysis inside its own XML tag, in this order: "
+    + ", ".join(f"<{name}>...</{name}>" for name in _LENS_PROMPTS)
+    + ". Do not write anything outside the tags.\n\n"
+    + "\n\n".join(f"<{name}> perspective:\n{prompt}" for name, prompt in _LENS_PROMPTS.items())
+)
+
+_LENS_SECTION_RES = {
+    name: re.compile(rf"<{name}>(.*?)</{name}>", re.DOTALL) for name in _LENS_PROMPTS
+}
+
+
+def _parse_lens_sections(text: str) -> list[str]:
+    """Split a combined-lens reply into [risk, execution, data_quality]; "" for a missing section."""
+    sections = []
+    for pattern in _LENS_SECTION_RES.values():
+        m = pattern.search(text)
+        sections.append(m.group(1).strip() if m else "")
+    return sections
+
+
+async def _run_lenses(task_text: str) -> list[str]:
+    """
+    Lens answers in _LENS_PROMPTS order ("" for a lens that failed).
+    The batched call and any per-lens fallback share one _LENS_TIMEOUT_BATCH budget.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _LENS_TIMEOUT_BATCH
+    sections = [""] * len(_LENS_PROMPTS)
+    try:
+        combined = await _call_haiku(
+            _COMBINED_LENS_PROMPT, task_text, top_p=0.85,
+            max_tokens=1024 * len(_LENS_PROMPTS),   # same per-lens budget as separate calls
+            timeout=_LENS_TIMEOUT_BATCH,
+        )
+        sections = _parse_lens_sections(combined)
+    except asyncio.TimeoutError:
+        return sections  # budget spent — a fallback round would only add latency
+    except Exception:
+        pass
+
+    # Re-run only the lenses the batched reply didn't cover, within what's left of the budget
+    missing = [i for i, section in enumerate(sections) if not section]
+    remaining = min(_LENS_TIMEOUT_EACH, deadline - loop.time())
+    if not missing or remaining <= 0:
+        return sections
+    prompts = list(_LENS_PROMPTS.values())
+    retried = await _run_all(
+        *(_call_haiku(prompts[i], task_text, top_p=0.85, timeout=remaining) for i in missing)
+    )
+    for i, answer in zip(missing, retried):
+        sections[i] = answer
+    return sections
+
+
 async def _three_lens(
     task_text: str,
     system_prompt: str,
 ) -> tuple[str, float]:
     """
-    Run 3 parallel Haiku calls with different analytical lenses.
-    Compute pairwise consensus. Synthesize with Sonnet.
+    Get risk / execution / data-quality lens answers from Haiku (one batched call,
+    3 parallel calls as fallback). Compute pairwise consensus. Synthesize with Sonnet
+    unless the lenses already agree (consensus >= _OVERLAP_HIGH).
 
     Returns (answer, mean_pairwise_consensus_score).
     """
-    risk_coro      = _call_haiku(_LENS_PROMPTS["risk"],        task_text, top_p=0.85, timeout=_LENS_TIMEOUT_EACH)
-    exec_coro      = _call_haiku(_LENS_PROMPTS["execution"],   task_text, top_p=0.85, timeout=_LENS_TIMEOUT_EACH)
-    quality_coro   = _call_haiku(_LENS_PROMPTS["data_quality"],task_text, top_p=0.85, timeout=_LENS_TIMEOUT_EACH)
-
-    results = await asyncio.gather(risk_coro, exec_coro, quality_coro, return_exceptions=True)
-
-    lens_a: str = results[0] if isinstance(results[0], str) else ""
-    lens_b: str = results[1] if isinstance(results[1], str) else ""
-    lens_c: str = results[2] if isinstance(results[2], str) else ""
+    lens_a, lens_b, lens_c = await _run_lenses(task_text)
 
-    # Pairwise overlap for consensus scoring
+    # Pairwise overlap for consensus scoring — each lens is tokenized once, not twice
+    words_a, words_b, words_c = _word_set(lens_a), _word_set(lens_b), _word_set(lens_c)
     pairs = [
-        compute_overlap(lens_a, lens_b),
-        compute_overlap(lens_b, lens_c),
-        compute_overlap(lens_a, lens_c),
+        _jaccard(words_a, words_b),
+        _jaccard(words_b, words_c),
+        _jaccard(words_a, words_c),
     ]
     mean_consensus = sum(pairs) / len(pairs) if pairs else 0.0
 
+    if mean_consensus >= _OVERLAP_HIGH:
+        # Lenses agree — Sonnet would only restate them; return the longest one
+        return max([lens_a, lens_b, lens_c], key=len), mean_consensus
+
     # Build Sonnet synthesis context
     synthesis_system = (
         "You are a senior analyst synthesizing multiple expert perspectives into one comprehensive answer. "
@@ -230,7 +345,7 @@ async def _three_lens(
         "Produce a single synthesized answer:"
     )
 
-    client = _client()
+    client = get_client()
     try:
         response = await asyncio.wait_for(
             client.messages.create(
@@ -356,7 +471,6 @@ async def numeric_moa_synthesize(
         return initial_answer
 
     # Only run for answers with actual financial numeric content
-    import re
     if not re.search(r'\d[\d,.]*', initial_answer):
         return initial_answer
 
@@ -369,16 +483,13 @@ async def numeric_moa_synthesize(
     challenge_coro = _call_haiku(_NUMERIC_CHALLENGE_PROMPT, user_content, top_p=0.95, max_tokens=800, timeout=10.0)
 
     try:
-        results = await asyncio.wait_for(
-            asyncio.gather(verify_coro, challenge_coro, return_exceptions=True),
+        verified, challenged = await asyncio.wait_for(
+            _run_all(verify_coro, challenge_coro),
             timeout=14.0,
         )
     except asyncio.TimeoutError:
         return initial_answer
 
-    verified: str  = results[0] if isinstance(results[0], str) and results[0] else ""
-    challenged: str = results[1] if isinstance(results[1], str) and results[1] else ""
-
     if not verified and not challenged:
         return initial_answer
     if not verified:
@@ -20,44 +20,66 @@ import json
 import re
 
 from src.config import ANTHROPIC_API_KEY
+from src.llm_client import get_client
 from src.token_budget import _is_bracket_format
 
 
-import re as _re
-
-
-def _has_structured_completion(answer: str) -> bool:
+_FIELD_VALUE_RE = re.compile(
+    r'^[A-Za-z][A-Za-z\s_]{1,30}:\s*.{3,}',  # "Field name: value"
+    re.MULTILINE
+)
+_COMPLETION_MARKERS = frozenset({
+    # Original
+    "approved", "rejected", "completed", "total:", "amount:", "decision:",
+    # Financial
+    "credit:", "debit:", "balance:", "variance:", "penalty:", "refund:",
+    # Risk/compliance
+    "risk:", "rating:", "score:", "level:", "finding:",
+    # Status/resolution
+    "status:", "resolved:", "closed:", "escalated:", "flagged:",
+    "processed:", "authorized:", "denied:", "blocked:",
+    # Action
+    "recommendation:", "action:", "next step:", "outcome:",
+})
+_COMPLETION_MARKERS_RE = re.compile("|".join(map(re.escape, sorted(_COMPLETION_MARKERS))))
+_ERROR_PHRASES = ("task failed", "error occurred", "unable to", "cannot access",
+                  "no data found", "tool unavailable", "token budget exhausted")
+_ERROR_PHRASES_RE = re.compile("|".join(map(re.escape, _ERROR_PHRASES)))
+_EMPTY_DATA_RE = re.compile(r'"data"\s*:\s*\[\s*\]')
+_EMPTY_RESULTS_RE = re.compile(r'"results"\s*:\s*\[\s*\]')
+
+
+def _has_structured_completion(answer: str, answer_lower: str | None = None) -> bool:
     """True if answer contains any field:value completion signal — domain-agnostic."""
     # Pattern 1: explicit field:value pairs (catches Risk rating:, Decision:, Total:, etc.)
-    field_value_pattern = _re.compile(
-        r'^[A-Za-z][A-Za-z\s_]{1,30}:\s*.{3,}',  # "Field name: value"
-        _re.MULTILINE
-    )
-    if field_value_pattern.search(answer):
+    if _FIELD_VALUE_RE.search(answer):
         return True
 
     # Pattern 2: expanded completion markers (original + domain-specific additions)
-    _COMPLETION_MARKERS = {
-        # Original
-        "approved", "rejected", "completed", "total:", "amount:", "decision:",
-        # Financial
-        "credit:", "debit:", "balance:", "variance:", "penalty:", "refund:",
-        # Risk/compliance
-        "risk:", "rating:", "score:", "level:", "finding:",
-        # Status/resolution
-        "status:", "resolved:", "closed:", "escalated:", "flagged:",
-        "processed:", "authorized:", "denied:", "blocked:",
-        # Action
-        "recommendation:", "action:", "next step:", "outcome:",
-    }
-    answer_lower = answer.lower()
-    return any(m in answer_lower for m in _COMPLETION_MARKERS)
+    if answer_lower is None:
+        answer_lower = answer.lower()
+    return _COMPLETION_MARKERS_RE.search(answer_lower) is not None
 
 REFLECTION_MODEL = "claude-haiku-4-5-20251001"
 REFLECTION_TIMEOUT = 8.0
 IMPROVE_THRESHOLD = 0.65     # reflect + improve if score below this
 REFLECTION_ENABLED = True    # set False to skip (e.g. if budget tight)
 
+_JSON_DECODER = json.JSONDecoder()
+
+# Fixed tail of every reflection prompt — built once, identical bytes on every call
+_REFLECT_INSTRUCTIONS = (
+    "Evaluate this answer. Does it:\n"
+    "1. Address ALL parts of the task?\n"
+    "2. Include required fields (amounts, IDs, decisions, reasons)?\n"
+    "3. Show evidence of data lookup (not just reasoning)?\n\n"
+    "Reply JSON only:\n"
+    '{"score": 0.0-1.0, "complete": true/false, '
+    '"missing": ["item1", "item2"], '
+    '"improve_prompt": "one sentence telling what to add"}'
+)
+
+
 
 # ── Reflection ────────────────────────────────────────────────────────────────
 
@@ -85,6 +107,10 @@ async def reflect_on_answer(
     if not REFLECTION_ENABLED or not ANTHROPIC_API_KEY:
         return {"score": 0.8, "complete": True, "missing": [], "improve_prompt": ""}
 
+    # Nothing to score or send to Haiku — ask for an answer outright
+    if not answer or answer.isspace():
+        return {"score": 0.0, "complete": False, "missing": ["answer"], "improve_prompt": "Provide an answer."}
+
     # Fast heuristic pre-check — skip Haiku if clearly good
     heuristic = _heuristic_score(answer, task_text, tool_count)
     if heuristic >= 0.85:
@@ -107,6 +133,7 @@ def _heuristic_score(answer: str, task_text: str, tool_count: int) -> float:
     Rewards: structured output, tool usage, completeness markers.
     """
     score = 0.5   # conservative baseline (BrainOS uses 0.5 too)
+    answer_lower = answer.lower()
 
     # Length signals
     answer_stripped = answer.strip()
@@ -130,23 +157,21 @@ def _heuristic_score(answer: str, task_text: str, tool_count: int) -> float:
 
     # Structure signals — reward JSON/structured content
     if "{" in answer and "}" in answer:  score += 0.08
-    if _has_structured_completion(answer):
+    if _has_structured_completion(answer, answer_lower):
         score += 0.08
 
     # Penalty: error phrases
-    error_phrases = ["task failed", "error occurred", "unable to", "cannot access",
-                     "no data found", "tool unavailable", "token budget exhausted"]
-    if any(p in answer.lower() for p in error_phrases):
+    if _ERROR_PHRASES_RE.search(answer_lower):
         score -= 0.25
 
     # Penalty: empty data arrays (BrainOS -0.25 rule)
-    if re.search(r'"data"\s*:\s*\[\s*\]', answer):
+    if _EMPTY_DATA_RE.search(answer):
         score -= 0.25
-    if re.search(r'"results"\s*:\s*\[\s*\]', answer):
+    if _EMPTY_RESULTS_RE.search(answer):
         score -= 0.15
 
     # Penalty: incomplete markers
-    if "TODO" in answer or "placeholder" in answer.lower():
+    if "TODO" in answer or "placeholder" in answer_lower:
         score -= 0.20
 
     return max(0.0, min(1.0, score))
@@ -159,8 +184,7 @@ async def _call_reflection(
     tool_count: int,
 ) -> dict:
     """Call Haiku to evaluate and identify gaps."""
-    import anthropic
-    client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    client = get_client()
 
     task_snippet = task_text[:1500]
     answer_snippet = answer[:2000]
@@ -175,21 +199,16 @@ async def _call_reflection(
                 f"Process: {process_label} | Tools used: {tool_count}\n"
                 f"Task: {task_snippet}\n"
                 f"Answer: {answer_snippet}\n\n"
-                "Evaluate this answer. Does it:\n"
-                "1. Address ALL parts of the task?\n"
-                "2. Include required fields (amounts, IDs, decisions, reasons)?\n"
-                "3. Show evidence of data lookup (not just reasoning)?\n\n"
-                "Reply JSON only:\n"
-                '{"score": 0.0-1.0, "complete": true/false, '
-                '"missing": ["item1", "item2"], '
-                '"improve_prompt": "one sentence telling what to add"}'
+                + _REFLECT_INSTRUCTIONS
             ),
         }],
     )
     text = resp.content[0].text if resp.content else ""
-    m = re.search(r'\{.*?\}', text, re.DOTALL)
-    if m:
-        parsed = json.loads(m.group())
+    # Decode from the first '{' — linear, no regex backtracking, and nested objects parse.
+    # A malformed object raises; reflect_on_answer falls back to the heuristic score.
+    start = text.find("{")
+    if start >= 0:
+        parsed, _ = _JSON_DECODER.raw_decode(text, start)
         return {
             "score": float(parsed.get("score", 0.7)),
             "complete": bool(parsed.get("complete", True)),
@@ -1,19 +1,37 @@
 from __future__ import annotations
 import asyncio
+import functools
 import json
 import os
+import re
 import time
 import uuid
+from collections import Counter, deque
+from datetime import datetime
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.worker_brain import run_worker   # MiniAIWorker replaces executor directly
 from src.training_loader import seed_from_training_data, is_stale
+from src.rl_loop import case_log_stats
 from src.context_rl import get_context_stats
 from src.dynamic_fsm import get_synthesis_stats
 from src.dynamic_tools import seed_amortization_tool, get_tool_registry_stats
 from src.strategy_bandit import get_stats as get_bandit_stats, ensure_warmed as bandit_warm
 from src.report_analyzer import analyze_and_save, load_intelligence
+from src.state_files import loads_state, read_json
+
+try:
+    import orjson  # noqa: F401 — ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse as _JSONResponse
+except ImportError:
+    _JSONResponse = JSONResponse
+
+try:
+    import ijson  # type: ignore
+    _IJSON_OK = True
+except ImportError:
+    _IJSON_OK = False
 from src.config import ANTHROPIC_API_KEY, FALLBACK_MODEL, FAST_MODEL, GREEN_AGENT_MCP_URL, BRAINOS_API_KEY, BRAINOS_ORG_ID
 from src.officeqa_executor import is_officeqa_task, handle_officeqa_turn  # OfficeQA evaluator
 
@@ -3478,7 +3496,7 @@ async def _handle_tau2_turn(context_id: str, message_text: str) -> str:
     )
     return answer
 
-app = FastAPI(title="BrainOS Purple Agent", version="5.0.0")
+app = FastAPI(title="BrainOS Purple Agent", version="5.0.0", default_response_class=_JSONResponse)
 
 AGENT_CARD = {
     "name": "BrainOS Purple Agent",
@@ -3508,6 +3526,13 @@ AGENT_CARD = {
     }],
 }
 
+# Static payloads — encoded once (same bytes JSONResponse would produce per request)
+_AGENT_CARD_BYTES = json.dumps(AGENT_CARD, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+_HEALTH_BYTES = json.dumps(
+    {"status": "ok", "agent": "brainos-mini-ai-worker", "version": "5.0.0"},
+    ensure_ascii=False, separators=(",", ":"),
+).encode("utf-8")
+
 
 @app.on_event("startup")
 async def on_startup():
@@ -3530,28 +3555,62 @@ async def on_startup():
     except Exception:
         pass  # Non-blocking — agent runs fine without this
 
-    import threading
-    def _seed():
-        try:
-            seed_from_training_data(force=False)
-        except Exception:
-            pass  # Never crash startup — agent runs degraded if seed fails
-    threading.Thread(target=_seed, daemon=True).start()
+    # Blocking S3/HTTP seed runs in the default executor; the task is kept on app.state
+    # so shutdown can cancel it if it is still waiting.
+    app.state.seed_task = asyncio.create_task(asyncio.to_thread(seed_from_training_data, force=False))
+    app.state.seed_task.add_done_callback(_log_seed_result)
+
+
+def _log_seed_result(task: asyncio.Task) -> None:
+    """Never crash startup — agent runs degraded if seed fails; just report it."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        print(f"[startup] training seed failed: {exc!r}", flush=True)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Cancel a still-pending training seed and close the shared Anthropic client."""
+    seed_task = getattr(app.state, "seed_task", None)
+    if seed_task is not None and not seed_task.done():
+        seed_task.cancel()
+
+    from src.llm_client import close_client
+    try:
+        await close_client()
+    except Exception:
+        pass  # Never block shutdown on a client close
 
 
 @app.get("/.well-known/agent-card.json")
 async def agent_card():
-    return JSONResponse(AGENT_CARD)
+    return Response(content=_AGENT_CARD_BYTES, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "agent": "brainos-mini-ai-worker", "version": "5.0.0"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+
+def _message_text(message: dict, text_parts_only: bool = False) -> str:
+    """Concatenated text of an A2A message's parts — single-part messages (the norm) skip the join."""
+    parts = message.get("parts") or ()
+    if len(parts) == 1:
+        part = parts[0]
+        if text_parts_only and part.get("type", "text") != "text":
+            return ""
+        return part.get("text", "")
+    return "".join(
+        p.get("text", "") for p in parts
+        if not text_parts_only or p.get("type", "text") == "text"
+    )
 
 
 @app.post("/")
 async def a2a_handler(request: Request):
-    body = await request.json()
+    body = loads_state(await request.body())
 
     # JSON-RPC 2.0: correlation id lives at top level of request
     jsonrpc_id = body.get("id")
@@ -3559,7 +3618,7 @@ async def a2a_handler(request: Request):
 
     # Accept both old (tasks/send) and new (message/send) A2A SDK methods
     if method not in ("tasks/send", "message/send"):
-        return JSONResponse({
+        return _JSONResponse({
             "jsonrpc": "2.0", "id": jsonrpc_id,
             "error": {"code": -32601, "message": "Method not found"},
         })
@@ -3573,10 +3632,7 @@ async def a2a_handler(request: Request):
         context_id = message.get("contextId", task_id)
         session_id = context_id
         # Parts in newer SDK have a "type" field
-        task_text = "".join(
-            p.get("text", "") for p in message.get("parts", [])
-            if p.get("type", "text") == "text"
-        )
+        task_text = _message_text(message, text_parts_only=True)
         metadata = params.get("metadata", {})
         policy_doc = metadata.get("policy_doc", "")
         tools_endpoint = metadata.get("tools_endpoint", "")
@@ -3586,7 +3642,7 @@ async def a2a_handler(request: Request):
         context_id = task_id
         message = params.get("message", {})
         metadata = params.get("metadata", {})
-        task_text = "".join(p.get("text", "") for p in message.get("parts", []))
+        task_text = _message_text(message)
         policy_doc = metadata.get("policy_doc", "")
         tools_endpoint = metadata.get("tools_endpoint", "")
         session_id = metadata.get("session_id", task_id)
@@ -3627,7 +3683,7 @@ async def a2a_handler(request: Request):
             answer = _re.sub(r'\n*\[Process:[^\]]*\]\s*$', '', answer.rstrip(), flags=_re.IGNORECASE)
     except Exception as exc:
         # Return JSON-RPC error (not 500 HTML) so benchmark evaluator can parse it
-        return JSONResponse({
+        return _JSONResponse({
             "jsonrpc": "2.0",
             "id": jsonrpc_id,
             "error": {"code": -32603, "message": f"Internal error: {exc}", "data": None},
@@ -3637,7 +3693,7 @@ async def a2a_handler(request: Request):
         # A2A SDK v0.2.x response: return a Message object.
         # - kind="message" discriminates Message vs Task in the union
         # - Parts use "kind" (not "type") in the newer SDK
-        return JSONResponse({
+        return _JSONResponse({
             "jsonrpc": "2.0",
             "id": jsonrpc_id,
             "result": {
@@ -3650,7 +3706,7 @@ async def a2a_handler(request: Request):
             },
         })
     else:
-        return JSONResponse({
+        return _JSONResponse({
             "jsonrpc": "2.0",
             "id": jsonrpc_id,   # required by JSON-RPC 2.0 spec
             "result": {
@@ -3661,6 +3717,72 @@ async def a2a_handler(request: Request):
         })
 
 
+# ── /rl/status file summaries ─────────────────────────────────────────────────
+# Each state file is parsed and summarized once per (mtime, size) stamp; repeated
+# GETs between writes are served from memory. Summaries are shared — callers copy
+# before mutating. Summarizers take any iterable of records (list or ijson stream).
+
+def _kb_summary(kb_entries) -> dict:
+    total = 0
+    domains: set[str] = set()
+    methods: Counter[str] = Counter()
+    last_ts = 0
+    for e in kb_entries:
+        total += 1
+        domains.add(e.get("domain", "unknown"))
+        methods[e.get("extraction_method", "haiku")] += 1
+        ts = e.get("created_at", 0)
+        if ts > last_ts:
+            last_ts = ts
+    return {
+        "total_entries": total,
+        "domains_covered": sorted(domains),
+        "last_extraction": (
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(last_ts))
+            if last_ts else None
+        ),
+        "by_extraction_method": dict(methods),
+    }
+
+
+def _entity_summary(entity_records) -> dict:
+    total = 0
+    type_counts: Counter[str] = Counter()
+    recurring = 0
+    for r in entity_records:
+        total += 1
+        type_counts[r.get("entity_type", "unknown")] += 1
+        if r.get("seen_count", 1) >= 2:
+            recurring += 1
+    return {
+        "total_entities": total,
+        "recurring_entities": recurring,
+        "by_type": dict(type_counts),
+    }
+
+
+_STREAM_MIN_BYTES = 1 << 20   # below this, parse-all (orjson) beats streaming
+
+
+@functools.lru_cache(maxsize=8)
+def _summarize_state_file(path: str, mtime_ns: int, size: int, summarize):
+    # summarize folds one record at a time, so large files are streamed with ijson —
+    # peak memory is one record, not the whole parsed list.
+    if _IJSON_OK and size >= _STREAM_MIN_BYTES:
+        with open(path, "rb") as f:
+            return summarize(ijson.items(f, "item", use_float=True))
+    return summarize(read_json(path))
+
+
+def _state_file_summary(path: str, summarize):
+    """summarize(parsed JSON) for path, cached until the file changes; None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _summarize_state_file(path, st.st_mtime_ns, st.st_size, summarize)
+
+
 @app.get("/rl/status")
 async def rl_status():
     """
@@ -3679,25 +3801,14 @@ async def rl_status():
     base_dir = os.path.join(os.path.dirname(__file__), "..")
 
     # ── Case log stats ────────────────────────────────────────────────────────
-    case_log_path = os.path.join(base_dir, "case_log.json")
+    # Live in-memory log (includes records not yet flushed to case_log.json)
     case_stats: dict = {"total": 0, "successes": 0, "failures": 0, "avg_quality": 0.0}
     try:
-        if os.path.exists(case_log_path):
-            with open(case_log_path) as f:
-                cases = json.load(f)
-            if cases:
-                qualities = [c.get("quality", 0) for c in cases]
-                case_stats = {
-                    "total": len(cases),
-                    "successes": sum(1 for c in cases if c.get("outcome") == "success"),
-                    "failures": sum(1 for c in cases if c.get("outcome") == "failure"),
-                    "avg_quality": round(sum(qualities) / len(qualities), 3),
-                }
+        case_stats = case_log_stats()
     except Exception:
         pass
 
     # ── Knowledge base stats ──────────────────────────────────────────────────
-    kb_path = os.path.join(base_dir, "knowledge_base.json")
     kb_stats: dict = {
         "total_entries": 0,
         "domains_covered": [],
@@ -3706,46 +3817,22 @@ async def rl_status():
         "by_extraction_method": {},
     }
     try:
-        if os.path.exists(kb_path):
-            with open(kb_path) as f:
-                kb_entries = json.load(f)
-            domains = list({e.get("domain", "unknown") for e in kb_entries})
-            methods: dict[str, int] = {}
-            for e in kb_entries:
-                m = e.get("extraction_method", "haiku")
-                methods[m] = methods.get(m, 0) + 1
-            last_ts = max((e.get("created_at", 0) for e in kb_entries), default=0)
+        kb_summary = _state_file_summary(os.path.join(base_dir, "knowledge_base.json"), _kb_summary)
+        if kb_summary is not None:
             kb_stats = {
-                "total_entries": len(kb_entries),
-                "domains_covered": sorted(domains),
+                "total_entries": kb_summary["total_entries"],
+                "domains_covered": kb_summary["domains_covered"],
                 "growth_rate": _compute_growth_rate(base_dir),
-                "last_extraction": (
-                    time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(last_ts))
-                    if last_ts else None
-                ),
-                "by_extraction_method": methods,
+                "last_extraction": kb_summary["last_extraction"],
+                "by_extraction_method": kb_summary["by_extraction_method"],
             }
     except Exception:
         pass
 
     # ── Entity memory stats ───────────────────────────────────────────────────
-    entity_path = os.path.join(base_dir, "entity_memory.json")
     entity_stats: dict = {"total_entities": 0, "recurring_entities": 0, "by_type": {}}
     try:
-        if os.path.exists(entity_path):
-            with open(entity_path) as f:
-                entity_records = json.load(f)
-            type_counts: dict[str, int] = {}
-            for r in entity_records:
-                t = r.get("entity_type", "unknown")
-                type_counts[t] = type_counts.get(t, 0) + 1
-            entity_stats = {
-                "total_entities": len(entity_records),
-                "recurring_entities": sum(
-                    1 for r in entity_records if r.get("seen_count", 1) >= 2
-                ),
-                "by_type": type_counts,
-            }
+        entity_stats = _state_file_summary(os.path.join(base_dir, "entity_memory.json"), _entity_summary) or entity_stats
     except Exception:
         pass
 
@@ -3772,9 +3859,12 @@ async def rl_status():
     }
 
 
-@app.get("/training/status")
-async def training_status():
-    """S3 training seed status — was the case log primed from benchmark data?"""
+_TRAINING_STATUS_TTL = 30.0   # seconds a /training/status snapshot is served from memory
+_training_status_cache: tuple[float, dict] | None = None   # (time.monotonic(), payload)
+
+
+def _training_status_snapshot() -> dict:
+    """Blocking part of /training/status — marker stats + intelligence load. Runs in a worker thread."""
     base_dir = os.path.join(os.path.dirname(__file__), "..")
     seeded_marker = os.path.join(base_dir, ".training_seeded")
     stale = True
@@ -3795,9 +3885,20 @@ async def training_status():
     }
 
 
-@app.post("/training/sync")
-async def training_sync():
-    """Force refresh from S3 / HTTP benchmark endpoint."""
+@app.get("/training/status")
+async def training_status():
+    """S3 training seed status — was the case log primed from benchmark data?"""
+    global _training_status_cache
+    cached = _training_status_cache
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _TRAINING_STATUS_TTL:
+        return cached[1]
+    payload = await asyncio.to_thread(_training_status_snapshot)
+    _training_status_cache = (now, payload)
+    return payload
+
+
+def _training_sync_blocking() -> dict:
     results: dict = {}
     try:
         seed_result = seed_from_training_data(force=True)
@@ -3813,6 +3914,20 @@ async def training_sync():
     return results
 
 
+@app.post("/training/sync")
+async def training_sync():
+    """Force refresh from S3 / HTTP benchmark endpoint."""
+    global _training_status_cache
+    results = await asyncio.to_thread(_training_sync_blocking)
+    _training_status_cache = None   # next /training/status reflects the sync
+    return results
+
+
+_GROWTH_TS_RE = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})')
+_GROWTH_NEW_RE = re.compile(r'new=(\d+)')
+_GROWTH_CACHE: dict[str, tuple[tuple[int, int], str]] = {}   # log path → ((mtime_ns, size), rate)
+
+
 def _compute_growth_rate(base_dir: str) -> str:
     """
     Compute knowledge growth rate from the last 10 lines of knowledge_growth.log.
@@ -3820,44 +3935,54 @@ def _compute_growth_rate(base_dir: str) -> str:
     """
     growth_log = os.path.join(base_dir, "knowledge_growth.log")
     try:
-        if not os.path.exists(growth_log):
+        try:
+            st = os.stat(growth_log)
+        except FileNotFoundError:
             return "0 entries/hour"
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _GROWTH_CACHE.get(growth_log)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        rate = _growth_rate_from_log(growth_log)
+        _GROWTH_CACHE[growth_log] = (stamp, rate)
+        return rate
+    except Exception:
+        return "unknown"
 
-        with open(growth_log) as f:
-            lines = f.readlines()
 
-        # Take the last 10 entries
-        recent = [ln.strip() for ln in lines[-10:] if ln.strip()]
-        if not recent:
-            return "0 entries/hour"
+def _growth_rate_from_log(growth_log: str) -> str:
+    """Rate string for _compute_growth_rate, computed from the log's last 10 lines."""
+    # Take the last 10 entries — deque keeps only those, not the whole log
+    with open(growth_log) as f:
+        lines = deque(f, maxlen=10)
 
-        # Parse timestamps from log lines: "2026-03-01T12:34:56 domain=... new=N total=N"
-        import re as _re
-        entries_total = 0
-        first_ts = None
-        last_ts = None
-
-        for ln in recent:
-            ts_m = _re.match(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})', ln)
-            new_m = _re.search(r'new=(\d+)', ln)
-            if ts_m and new_m:
-                ts_str = ts_m.group(1)
-                ts = time.mktime(time.strptime(ts_str, "%Y-%m-%dT%H:%M:%S"))
-                new = int(new_m.group(1))
-                entries_total += new
-                if first_ts is None:
-                    first_ts = ts
-                last_ts = ts
-
-        if first_ts is None or last_ts is None or last_ts == first_ts:
-            return f"{entries_total} entries (window too short)"
-
-        elapsed_hours = (last_ts - first_ts) / 3600
-        if elapsed_hours < 0.01:
-            return f"{entries_total} entries (window too short)"
-
-        rate = entries_total / elapsed_hours
-        return f"{rate:.1f} entries/hour"
+    recent = [ln.strip() for ln in lines if ln.strip()]
+    if not recent:
+        return "0 entries/hour"
+
+    # Parse timestamps from log lines: "2026-03-01T12:34:56 domain=... new=N total=N"
+    entries_total = 0
+    first_ts = None
+    last_ts = None
+
+    for ln in recent:
+        ts_m = _GROWTH_TS_RE.match(ln)
+        new_m = _GROWTH_NEW_RE.search(ln)
+        if ts_m and new_m:
+            ts = datetime.fromisoformat(ts_m.group(1)).timestamp()
+            new = int(new_m.group(1))
+            entries_total += new
+            if first_ts is None:
+                first_ts = ts
+            last_ts = ts
+
+    if first_ts is None or last_ts is None or last_ts == first_ts:
+        return f"{entries_total} entries (window too short)"
+
+    elapsed_hours = (last_ts - first_ts) / 3600
+    if elapsed_hours < 0.01:
+        return f"{entries_total} entries (window too short)"
+
+    rate = entries_total / elapsed_hours
+    return f"{rate:.1f} entries/hour"
 
-    except Exception:
-        return "unknown"
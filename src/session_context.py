@@ -10,23 +10,29 @@ Each session_id gets:
 """
 from __future__ import annotations
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 MAX_SESSION_AGE = 3600   # 1 hour idle → evict
+MAX_SESSIONS = 5000      # hard cap — least recently active evicted first
+_SWEEP_INTERVAL = 30.0   # seconds between idle-session sweeps
+_last_sweep = 0.0        # time.monotonic() of the last sweep
 MAX_RAW_TURNS = 20
 KEEP_RECENT = 6
 
-_sessions: dict[str, "SessionContext"] = {}
+# Ordered by last_active (oldest first): new sessions are appended and add_turn moves a
+# session to the end when it refreshes last_active, so stale ones cluster at the front.
+_sessions: OrderedDict[str, "SessionContext"] = OrderedDict()
 
 
-@dataclass
+@dataclass(slots=True)
 class Turn:
     role: str
     content: str
     timestamp: float = field(default_factory=time.time)
 
 
-@dataclass
+@dataclass(slots=True)
 class FSMCheckpoint:
     """Persisted FSM state for multi-turn continuity. Mirrors BrainOS checkpoint_data."""
     process_type: str
@@ -35,43 +41,60 @@ class FSMCheckpoint:
     requires_hitl: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionContext:
     session_id: str
     turns: list[Turn] = field(default_factory=list)
-    compressed_summary: str = ""
+    summary_chunks: list[str] = field(default_factory=list)   # joined lazily — no O(N²) re-concatenation
     fsm_checkpoint: FSMCheckpoint | None = None
     schema_cache: dict = field(default_factory=dict)   # column correction cache
     created_at: float = field(default_factory=time.time)
     last_active: float = field(default_factory=time.time)
+    version: int = 0   # bumped whenever turns / summary change — keys prompt_cache
+    prompt_cache: tuple[int, str] | None = field(default=None, repr=False)
+
+    @property
+    def compressed_summary(self) -> str:
+        return "\n\n".join(self.summary_chunks)
 
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
 def get_or_create(session_id: str) -> SessionContext:
     _evict_stale()
-    if session_id not in _sessions:
-        _sessions[session_id] = SessionContext(session_id=session_id)
-    return _sessions[session_id]
+    ctx = _sessions.get(session_id)
+    if ctx is not None and time.time() - ctx.last_active > MAX_SESSION_AGE:
+        # Idle past the TTL but not yet swept — start fresh, as if it had been evicted
+        del _sessions[session_id]
+        ctx = None
+    if ctx is None:
+        if len(_sessions) >= MAX_SESSIONS:
+            _sessions.popitem(last=False)
+        ctx = _sessions[session_id] = SessionContext(session_id=session_id)
+    return ctx
 
 
 def add_turn(session_id: str, role: str, content: str) -> None:
     ctx = get_or_create(session_id)
     ctx.turns.append(Turn(role=role, content=content))
     ctx.last_active = time.time()
+    ctx.version += 1
+    _sessions.move_to_end(session_id)
     # Inline fallback — replaced by async Haiku compression when executor calls maybe_compress_async()
     if len(ctx.turns) > MAX_RAW_TURNS * 2:
         _compress_inline(ctx)
 
 
 def get_context_prompt(session_id: str) -> str:
-    """Compressed history + recent turns for system prompt injection."""
+    """Compressed history + recent turns for system prompt injection (cached until the session changes)."""
     ctx = _sessions.get(session_id)
-    if not ctx or (not ctx.compressed_summary and not ctx.turns):
+    if not ctx or (not ctx.summary_chunks and not ctx.turns):
         return ""
+    if ctx.prompt_cache is not None and ctx.prompt_cache[0] == ctx.version:
+        return ctx.prompt_cache[1]
 
     parts = []
-    if ctx.compressed_summary:
+    if ctx.summary_chunks:
         parts.append(f"## Prior Conversation Summary\n{ctx.compressed_summary}")
 
     recent = ctx.turns[-KEEP_RECENT:]
@@ -81,7 +104,9 @@ def get_context_prompt(session_id: str) -> str:
             label = "User" if t.role == "user" else "Agent"
             parts.append(f"{label}: {t.content[:1000]}")
 
-    return "\n".join(parts)
+    prompt = "\n".join(parts)
+    ctx.prompt_cache = (ctx.version, prompt)
+    return prompt
 
 
 def is_multi_turn(session_id: str) -> bool:
@@ -128,9 +153,8 @@ async def maybe_compress_async(session_id: str) -> None:
         if m.get("role") in ("user", "assistant")
     ]
     ctx.turns = new_turns
-    ctx.compressed_summary = (
-        ctx.compressed_summary + "\n\n" + summary if ctx.compressed_summary else summary
-    )
+    ctx.summary_chunks.append(summary)
+    ctx.version += 1
 
 
 # ── FSM state persistence ─────────────────────────────────────────────────────
@@ -167,15 +191,24 @@ def _compress_inline(ctx: SessionContext) -> None:
     if not older:
         return
     lines = [f"{'User' if t.role == 'user' else 'Agent'}: {t.content[:500]}" for t in older]
-    block = "\n".join(lines)
-    ctx.compressed_summary = (
-        ctx.compressed_summary + "\n\n" + block if ctx.compressed_summary else block
-    )
+    ctx.summary_chunks.append("\n".join(lines))
     ctx.turns = keep
+    ctx.version += 1
 
 
 def _evict_stale() -> None:
+    """
+    Pop idle sessions from the front; stops at the first live one (see _sessions ordering).
+    Runs at most once per _SWEEP_INTERVAL — get_or_create checks its own hit for staleness.
+    """
+    global _last_sweep
+    mono = time.monotonic()
+    if mono - _last_sweep < _SWEEP_INTERVAL:
+        return
+    _last_sweep = mono
     now = time.time()
-    stale = [sid for sid, ctx in _sessions.items() if now - ctx.last_active > MAX_SESSION_AGE]
-    for sid in stale:
-        del _sessions[sid]
+    while _sessions:
+        ctx = next(iter(_sessions.values()))
+        if now - ctx.last_active <= MAX_SESSION_AGE:
+            break
+        _sessions.popitem(last=False)
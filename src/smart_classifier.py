@@ -15,16 +15,25 @@ Example where keywords fail:
 Falls back to keyword matching if Haiku unavailable or times out.
 """
 from __future__ import annotations
-import asyncio
 import json
 import re
 import time
+from collections import OrderedDict
 
-from src.config import ANTHROPIC_API_KEY, FALLBACK_MODEL
+from src.config import ANTHROPIC_API_KEY, CLASSIFIER_CACHE_TTL, FALLBACK_MODEL
+from src.llm_client import get_client
 
 CLASSIFIER_MODEL = "claude-haiku-4-5-20251001"
 CLASSIFIER_TIMEOUT = 5.0   # seconds — fall back to keywords if exceeded
 
+CLASSIFIER_INPUT_CHARS = 1500   # task prefix Haiku sees — also the cache key
+_CACHE_MAX = 1024
+# task_text[:CLASSIFIER_INPUT_CHARS] → (process_type, confidence, stored_at); LRU order
+_RESULT_CACHE: OrderedDict[str, tuple[str, float, float]] = OrderedDict()
+
+# Leading ```lang fence or trailing ``` fence, stripped in one pass
+_FENCE_RE = re.compile(r"\A```[a-z]*\n?|\n?```\Z")
+
 # Used for documentation and _keyword_fallback only.
 # The _call_classifier function trusts whatever Haiku returns without filtering.
 VALID_PROCESS_TYPES = {
@@ -61,37 +70,46 @@ async def classify_process_type(task_text: str) -> tuple[str, float]:
     Classify task into a process type using Haiku.
     Returns (process_type, confidence).
     Falls back to keyword matching on timeout, error, or missing API key.
+    Haiku results are reused for CLASSIFIER_CACHE_TTL seconds per task prefix.
     """
     if not ANTHROPIC_API_KEY:
         return _keyword_fallback(task_text), 0.5
 
+    key = task_text[:CLASSIFIER_INPUT_CHARS]
+    hit = _RESULT_CACHE.get(key)
+    if hit is not None:
+        if time.time() - hit[2] <= CLASSIFIER_CACHE_TTL:
+            _RESULT_CACHE.move_to_end(key)
+            return hit[0], hit[1]
+        del _RESULT_CACHE[key]
+
     try:
-        result = await asyncio.wait_for(
-            _call_classifier(task_text),
-            timeout=CLASSIFIER_TIMEOUT,
-        )
+        result = await _call_classifier(task_text)
+        if CLASSIFIER_CACHE_TTL > 0:
+            _RESULT_CACHE[key] = (result[0], result[1], time.time())
+            if len(_RESULT_CACHE) > _CACHE_MAX:
+                _RESULT_CACHE.popitem(last=False)
         return result
-    except asyncio.TimeoutError:
-        return _keyword_fallback(task_text), 0.5
-    except Exception:
+    except Exception:  # incl. anthropic.APITimeoutError past CLASSIFIER_TIMEOUT
         return _keyword_fallback(task_text), 0.5
 
 
 async def _call_classifier(task_text: str) -> tuple[str, float]:
-    import anthropic
-    client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    # No SDK retries — a retry backoff can't fit in CLASSIFIER_TIMEOUT; keywords take over instead
+    # (raises ImportError without the SDK, which also falls back to keywords)
+    client = get_client().with_options(max_retries=0)
     resp = await client.messages.create(
         model=CLASSIFIER_MODEL,
         max_tokens=120,
+        timeout=CLASSIFIER_TIMEOUT,   # enforced by the HTTP client — no wait_for task wrapper
         system=_CLASSIFIER_PROMPT,
-        messages=[{"role": "user", "content": task_text[:1500]}],
+        messages=[{"role": "user", "content": task_text[:CLASSIFIER_INPUT_CHARS]}],
     )
     text = resp.content[0].text if resp.content else ""
     # Strip markdown fences that Haiku sometimes prepends (```json ... ```)
     clean = text.strip()
     if clean.startswith("```"):
-        clean = re.sub(r"^```[a-z]*\n?", "", clean)
-        clean = re.sub(r"\n?```$", "", clean).strip()
+        clean = _FENCE_RE.sub("", clean).strip()
     parsed = json.loads(clean)
     ptype = parsed.get("process_type", "general")
     conf = float(parsed.get("confidence", 0.7))
@@ -102,30 +120,33 @@ async def _call_classifier(task_text: str) -> tuple[str, float]:
     return ptype, conf
 
 
+# Keyword → process type table for _keyword_fallback (built once, not per call)
+_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "expense_approval":       ("expense", "reimbursement", "receipt", "spend", "claim"),
+    "procurement":            ("vendor", "purchase order", "rfp", "supplier", "procurement"),
+    "hr_offboarding":         ("offboarding", "termination", "access revocation", "exit", "last day"),
+    "incident_response":      ("incident", "outage", "p1", "p2", "emergency", "sev"),
+    "invoice_reconciliation": ("invoice", "reconcile", "3-way match", "accounts payable", "ap "),
+    "customer_onboarding":    ("onboarding", "new customer", "new client", "provision"),
+    "compliance_audit":       ("compliance", "audit", "kyc", "gdpr", "pci", "sox"),
+    "dispute_resolution":     ("dispute", "chargeback", "complaint", "contested"),
+    "order_management":       ("order", "fulfillment", "shipment", "delivery"),
+    "sla_breach":             ("sla", "service level", "uptime breach", "penalty", "credit"),
+    "month_end_close":        ("month-end", "month end", "close", "p&l", "financial close"),
+    "ar_collections":         ("accounts receivable", "overdue", "collection", "aging"),
+    "subscription_migration": ("migrate", "migration", "downgrade", "upgrade", "plan change",
+                               "plan migration", "saas migration", "subscription migration",
+                               "require_customer_signoff", "customer signoff", "enterprise migration"),
+    "payroll":                ("payroll", "salary", "pay run", "wages"),
+}
+
+
 def _keyword_fallback(task_text: str) -> str:
     """Original keyword-based detection — used as fallback and for VALID_PROCESS_TYPES reference."""
-    KEYWORDS: dict[str, list[str]] = {
-        "expense_approval":       ["expense", "reimbursement", "receipt", "spend", "claim"],
-        "procurement":            ["vendor", "purchase order", "rfp", "supplier", "procurement"],
-        "hr_offboarding":         ["offboarding", "termination", "access revocation", "exit", "last day"],
-        "incident_response":      ["incident", "outage", "p1", "p2", "emergency", "sev"],
-        "invoice_reconciliation": ["invoice", "reconcile", "3-way match", "accounts payable", "ap "],
-        "customer_onboarding":    ["onboarding", "new customer", "new client", "provision"],
-        "compliance_audit":       ["compliance", "audit", "kyc", "gdpr", "pci", "sox"],
-        "dispute_resolution":     ["dispute", "chargeback", "complaint", "contested"],
-        "order_management":       ["order", "fulfillment", "shipment", "delivery"],
-        "sla_breach":             ["sla", "service level", "uptime breach", "penalty", "credit"],
-        "month_end_close":        ["month-end", "month end", "close", "p&l", "financial close"],
-        "ar_collections":         ["accounts receivable", "overdue", "collection", "aging"],
-        "subscription_migration": ["migrate", "migration", "downgrade", "upgrade", "plan change",
-                                   "plan migration", "saas migration", "subscription migration",
-                                   "require_customer_signoff", "customer signoff", "enterprise migration"],
-        "payroll":                ["payroll", "salary", "pay run", "wages"],
-    }
     text = task_text.lower()
     best, best_score = "general", 0
-    for ptype, kws in KEYWORDS.items():
-        score = sum(1 for kw in kws if kw in text)
+    for ptype, kws in _KEYWORDS.items():
+        score = sum(kw in text for kw in kws)   # distinct keywords present, not occurrences
         if score > best_score:
             best_score, best = score, ptype
     return best
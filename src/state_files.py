@@ -0,0 +1,64 @@
+"""
+state_files.py
+JSON encode/decode + atomic writes for the agent's on-disk state
+(case_log.json, benchmark_intelligence.json).
+
+Uses orjson when installed (C encoder/decoder, bytes in/out), falling back
+to the stdlib json module. Output is compact unless PRETTY_STATE_FILES=1.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+
+from src.config import PRETTY_STATE_FILES
+
+try:
+    import orjson  # type: ignore
+    _ORJSON_OK = True
+except ImportError:
+    _ORJSON_OK = False
+
+
+def dumps_state(obj) -> bytes:
+    """Serialize state to JSON bytes (compact, or indent=2 when PRETTY_STATE_FILES)."""
+    if _ORJSON_OK:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if PRETTY_STATE_FILES else 0)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits — stdlib json handles them
+    if PRETTY_STATE_FILES:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads_state(data: bytes):
+    """Parse JSON bytes produced by dumps_state (or any JSON writer)."""
+    if _ORJSON_OK:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: str):
+    """Read and parse a JSON state file (raises OSError / ValueError like json.load)."""
+    with open(path, "rb") as f:
+        return loads_state(f.read())
+
+
+def write_json_atomic(path: str, obj, prefix: str = ".state.") -> None:
+    """Write JSON to a temp file in the same dir, fsync, then os.replace — readers never see a torn file."""
+    data = dumps_state(obj)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -191,7 +191,7 @@ def _record_to_case_entry(record: dict) -> CaseEntry | None:
     return CaseEntry(
         case_id=case_id,
         task_summary=task_summary[:200],
-        keywords=_extract_keywords(task_summary),
+        keywords=list(_extract_keywords(task_summary)),
         outcome="success",
         quality=1.0,
         what_worked=what_worked,
@@ -239,10 +239,9 @@ def seed_from_training_data(force: bool = False) -> dict:
         return {"seeded": 0, "skipped": False, "source": source, "total_cases": len(_load_cases())}
 
     # Merge with existing cases — seed entries go first (highest priority primer)
-    from dataclasses import asdict
     existing = _load_cases()
     existing_ids = {c.get("case_id") for c in existing}
-    fresh = [asdict(e) for e in new_entries if e.case_id not in existing_ids]
+    fresh = [e.to_dict() for e in new_entries if e.case_id not in existing_ids]
     merged = fresh + existing  # seed entries at front → highest retrieval priority
     _save_cases(merged)
 